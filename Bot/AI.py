@@ -1,113 +1,195 @@
-import tkinter as tk
-from tkinter import messagebox, colorchooser
-import speech_recognition as sr
-import pyttsx3
-import spacy
-from nltk.corpus import cmudict
-from textblob import TextBlob
-import requests
-import random
-import threading
-from transformers import pipeline
-
-import nltk
-nltk.download('cmudict')
-nltk.download('wordnet')
-# it's not worked
-
-class AIJarvis:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("AI Jarvis")
-        self.root.geometry("600x400")
-
-        self.recognizer = sr.Recognizer()
-        self.tts_engine = pyttsx3.init()
-        self.nlp = spacy.load("en_core_web_sm")
-        self.pronouncing_dict = cmudict.dict()
-
-        # Initialize NLP models
-        self.conversational_model = pipeline("conversational", model="microsoft/DialoGPT-medium")
-        self.translation_pipeline = pipeline("translation_en_to_fr")
-
-        # Create GUI components
-        self.create_widgets()
-
-    def create_widgets(self):
-        """Create GUI components."""
-        self.output_area = tk.Text(self.root, height=10, width=70)
-        self.output_area.pack(pady=10)
-
-        self.input_entry = tk.Entry(self.root, width=50)
-        self.input_entry.pack(pady=10)
-
-        self.send_button = tk.Button(self.root, text="Send", command=self.process_command_from_entry)
-        self.send_button.pack(pady=10)
-
-        self.listen_button = tk.Button(self.root, text="Listen", command=self.listen)
-        self.listen_button.pack(pady=10)
-
-        self.color_button = tk.Button(self.root, text="Change Bulb Color", command=self.change_color)
-        self.color_button.pack(pady=10)
-
-    def speak(self, text):
-        """Convert text to speech output."""
-        self.tts_engine.say(text)
-        self.tts_engine.runAndWait()
-        self.output_area.insert(tk.END, f"Jarvis: {text}\n")
-        self.output_area.see(tk.END)
-
-    def listen(self):
-        """Listen to the user and return recognized text."""
-        with sr.Microphone() as source:
-            self.output_area.insert(tk.END, "Listening...\n")
-            self.root.update()
-            audio = self.recognizer.listen(source)
-            try:
-                text = self.recognizer.recognize_google(audio)
-                self.output_area.insert(tk.END, f"You: {text}\n")
-                self.root.update()
-                self.process_command(text)
-            except sr.UnknownValueError:
-                self.speak("Sorry, I didn't catch that.")
-            except sr.RequestError:
-                self.speak("Service is down.")
-
-    def process_command_from_entry(self):
-        """Process command from input entry."""
-        command = self.input_entry.get()
-        self.output_area.insert(tk.END, f"You: {command}\n")
-        self.input_entry.delete(0, tk.END)
-        self.process_command(command)
-
-    def process_command(self, command):
-        """Identify and execute commands based on user input."""
-        if "translate" in command:
-            _, _, text = command.partition("translate")
-            self.translate_text(text.strip())
-        elif "suggest a vocabulary word" in command:
-            self.suggest_vocabulary()
-        else:
-            self.default_conversation(command)
-
-    def default_conversation(self, text):
-        """Handle general conversation using a conversational AI model."""
-        response = self.conversational_model(text)[0]["generated_text"]
-        self.speak(response)
-
-    def translate_text(self, text):
-        """Translate text from English to French."""
-        translated_text = self.translation_pipeline(text)[0]["translation_text"]
-        self.speak(f"The French translation is: {translated_text}")
-
-    def suggest_vocabulary(self):
-        """Suggest vocabulary words with definitions."""
-        words = ["articulate", "eloquent", "lucid", "verbose", "succinct"]
-        word = random.choice(words)
-        self.speak(f"Today's vocabulary word is '{word}'. It means something clear or expressive.")
-
-    def change_color(self):
-        """Change the color of the smart bulb."""  
-        color = colorchooser.askcolor()[1]
-        if color:
-            self.speak(f"Changed the bulb color to {color}.")
+import tkinter as tk
+from tkinter import messagebox, colorchooser
+import speech_recognition as sr
+import pyttsx3
+import requests
+import random
+import threading
+
+from inference import model_version
+from memo import DEFAULT_CACHE_PATH, ReplyCache
+from models import ModelRegistry, load_pipeline
+from intents import IntentMatcher
+from tasks import TaskLanes
+
+# Trigger phrases of each command, matched as whole words in any case; anything else is conversation
+COMMANDS = IntentMatcher({
+    "translate": ["translate"],
+    "suggest_vocabulary": ["suggest a vocabulary word"],
+})
+
+class AIJarvis:
+    def __init__(self, root, backend="int8", threads=None, cache_path=DEFAULT_CACHE_PATH):
+        self.root = root
+        self.root.title("AI Jarvis")
+        self.root.geometry("600x400")
+
+        # The TTS engine is created by the thread that speaks
+        self.recognizer = sr.Recognizer()
+        self.tts_engine = None
+        self.tasks = TaskLanes(root)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        # NLP models load on first use, or in the background once the window is up
+        self.backend = backend
+        self.threads = threads
+        self.cache = ReplyCache(cache_path)  # Replies to inputs seen before, also across restarts
+        self.models = ModelRegistry()
+        self.add_model("translation", "translation_en_to_fr")
+        self.add_model("conversation", "conversational", "microsoft/DialoGPT-medium")
+
+        # Create GUI components
+        self.create_widgets()
+        self.root.after(100, self.models.warm_up)
+        self.root.after(200, self.show_model_status)
+
+    @property
+    def conversational_model(self):
+        return self.models.get("conversation")
+
+    @property
+    def translation_pipeline(self):
+        return self.models.get("translation")
+
+    def add_model(self, name, task, model=None):
+        """Register a pipeline; cache lookups match its version from the start, before it loads."""
+        self.cache.use_version(name, model_version(task, model, self.backend))
+        self.models.register(name, lambda: self.load_model(name, task, model))
+
+    def load_model(self, name, task, model=None):
+        """Load a pipeline, dropping cached outputs of any other version of it (e.g. after a download)."""
+        pipe = load_pipeline(task, model=model, backend=self.backend, threads=self.threads)
+        self.cache.use_version(name, model_version(task, model, pipe.backend))
+        return pipe
+
+    def create_widgets(self):
+        """Create GUI components."""
+        self.output_area = tk.Text(self.root, height=10, width=70)
+        self.output_area.pack(pady=10)
+
+        self.input_entry = tk.Entry(self.root, width=50)
+        self.input_entry.pack(pady=10)
+
+        self.send_button = tk.Button(self.root, text="Send", command=self.process_command_from_entry)
+        self.send_button.pack(pady=10)
+
+        self.listen_button = tk.Button(self.root, text="Listen", command=self.listen)
+        self.listen_button.pack(pady=10)
+
+        self.color_button = tk.Button(self.root, text="Change Bulb Color", command=self.change_color)
+        self.color_button.pack(pady=10)
+
+        self.status_label = tk.Label(self.root, text="Loading models...", anchor="w")
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+
+    def show_model_status(self):
+        """Show model loading progress reported by the registry."""
+        for name, state, seconds in self.models.events():
+            if state == "loading":
+                self.status_label.config(text=f"Loading {name}...")
+            elif state == "failed":
+                self.status_label.config(text=f"Could not load {name}")
+            elif not self.models.pending():
+                self.status_label.config(text="Ready")
+            else:
+                self.status_label.config(text=f"Loaded {name} in {seconds:.1f}s")
+        self.root.after(200, self.show_model_status)
+
+    def close(self):
+        """Stop the background lanes and close the window."""
+        self.tasks.close()
+        self.cache.close()
+        self.root.destroy()
+
+    def speak(self, text):
+        """Show text and queue it for speech output; returns the speech task."""
+        self.output_area.insert(tk.END, f"Jarvis: {text}\n")
+        self.output_area.see(tk.END)
+        return self.tasks.submit("tts", self.say, text)
+
+    def say(self, text):
+        """Convert text to speech output (runs on the TTS lane, which owns the engine)."""
+        if self.tts_engine is None:
+            self.tts_engine = pyttsx3.init()
+        self.tts_engine.say(text)
+        self.tts_engine.runAndWait()
+
+    def listen(self, after=None):
+        """Listen to the user in the background, once the task `after` (e.g. a prompt being spoken) is done."""
+        self.output_area.insert(tk.END, "Listening...\n")
+        self.output_area.see(tk.END)
+        self.tasks.submit("asr", self.recognize, after, on_done=self.heard, on_error=self.not_heard)
+
+    def recognize(self, after=None):
+        """Record one phrase and return its text (runs on the ASR lane)."""
+        if after is not None:
+            after.result()  # Don't record our own voice
+        with sr.Microphone() as source:
+            audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=15)
+        return self.recognizer.recognize_google(audio)
+
+    def heard(self, text):
+        """Process recognized speech."""
+        self.output_area.insert(tk.END, f"You: {text}\n")
+        self.output_area.see(tk.END)
+        self.process_command(text)
+
+    def not_heard(self, error):
+        """Report a failed recognition."""
+        if isinstance(error, (sr.UnknownValueError, sr.WaitTimeoutError)):
+            self.speak("Sorry, I didn't catch that.")
+        elif isinstance(error, sr.RequestError):
+            self.speak("Service is down.")
+        else:
+            print(f"Error listening: {error}")
+            self.speak("I couldn't use the microphone.")
+
+    def process_command_from_entry(self):
+        """Process command from input entry."""
+        command = self.input_entry.get()
+        self.output_area.insert(tk.END, f"You: {command}\n")
+        self.input_entry.delete(0, tk.END)
+        self.process_command(command)
+
+    def process_command(self, command):
+        """Identify and execute commands based on user input."""
+        intent = COMMANDS.match(command)
+        if intent is None:
+            self.default_conversation(command)
+        elif intent.name == "translate":
+            self.translate_text(intent.rest)
+        elif intent.name == "suggest_vocabulary":
+            self.suggest_vocabulary()
+
+    def default_conversation(self, text):
+        """Handle general conversation using a conversational AI model."""
+        reply = self.cache.get("conversation", text, disk=False)
+        if reply is not None:
+            self.speak(reply)
+            return
+        self.tasks.submit("inference", self.cache.memoize, "conversation", text,
+                          lambda: self.conversational_model(text)[0]["generated_text"], on_done=self.speak)
+
+    def translate_text(self, text):
+        """Translate text from English to French."""
+        def answer(translated_text):
+            self.speak(f"The French translation is: {translated_text}")
+
+        translated_text = self.cache.get("translation", text, disk=False)
+        if translated_text is not None:
+            answer(translated_text)
+            return
+        self.tasks.submit("inference", self.cache.memoize, "translation", text,
+                          lambda: self.translation_pipeline(text)[0]["translation_text"], on_done=answer)
+
+    def suggest_vocabulary(self):
+        """Suggest vocabulary words with definitions."""
+        words = ["articulate", "eloquent", "lucid", "verbose", "succinct"]
+        word = random.choice(words)
+        self.speak(f"Today's vocabulary word is '{word}'. It means something clear or expressive.")
+
+    def change_color(self):
+        """Change the color of the smart bulb."""  
+        color = colorchooser.askcolor()[1]
+        if color:
+            self.speak(f"Changed the bulb color to {color}.")
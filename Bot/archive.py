@@ -0,0 +1,240 @@
+# archive.py
+"""Raw page archive: responses kept as gzipped WARC records in rotating segments, with an SQLite offset index.
+
+Every record is its own gzip member, so one page can be read back by seeking to
+its offset, and `python archive.py reprocess` re-runs extraction over a whole
+archive in parallel without touching the network.
+"""
+import base64
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from multiprocessing.util import Finalize
+from typing import Iterator, List, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from extract import PageExtractor, decode_body
+from schema import ExtractionSchema
+from sink import RecordSink, RotatingFile, TableSink
+
+# Headers describing the transfer rather than the stored (already decoded) body
+TRANSFER_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+_worker_state = None  # (extractor, sink, table_sink) of a reprocess worker, see _init_reprocess()
+
+
+def _charset(content_type: str) -> Optional[str]:
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'charset' and value:
+            return value.strip('"\' ')
+    return None
+
+
+class PageArchive:
+    """Appends raw responses to archive/pages.NNNNN.warc.gz segments and indexes where each one starts."""
+
+    def __init__(self, directory: str, max_segment_mb: int = 1024):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segments = RotatingFile(directory, 'pages', 'warc.gz', max_segment_mb * 1024 * 1024)
+        self.conn = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                url TEXT NOT NULL, segment TEXT NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL,
+                status INTEGER, content_type TEXT, fetched REAL)
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS records_url ON records (url)")
+        self.conn.commit()
+        self.written = 0
+        self._pending: List[Tuple] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def warc_record(url: str, response: requests.Response, body: bytes, fetched: float) -> bytes:
+        """A WARC/1.1 response record holding the HTTP status line, headers and decoded body."""
+        reason = response.reason or ''
+        lines = [f"HTTP/1.1 {response.status_code} {reason}".rstrip()]
+        lines += [f"{name}: {value}" for name, value in response.headers.items()
+                  if name.lower() not in TRANSFER_HEADERS]
+        lines.append(f"Content-Length: {len(body)}")
+        block = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', errors='replace') + body
+        digest = base64.b32encode(hashlib.sha1(body).digest()).decode('ascii')
+        date = datetime.fromtimestamp(fetched, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        header = (f"WARC/1.1\r\nWARC-Type: response\r\nWARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+                  f"WARC-Date: {date}\r\nWARC-Target-URI: {url}\r\nWARC-Payload-Digest: sha1:{digest}\r\n"
+                  f"Content-Type: application/http; msgtype=response\r\nContent-Length: {len(block)}\r\n\r\n")
+        return header.encode('utf-8') + block + b'\r\n\r\n'
+
+    def write(self, url: str, response: requests.Response, body: bytes):
+        """Archives one fetched page; the index row is committed at the next commit()."""
+        fetched = time.time()
+        record = gzip.compress(self.warc_record(url, response, body, fetched), compresslevel=6)
+        with self._lock:
+            path, offset = self.segments.write(record)
+            self._pending.append((url, os.path.basename(path), offset, len(record), response.status_code,
+                                  response.headers.get('Content-Type'), fetched))
+            self.written += 1
+
+    def commit(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        with self.conn:
+            self.conn.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?)", pending)
+
+    def close(self):
+        self.commit()
+        with self._lock:
+            self.segments.close()
+        self.conn.close()
+
+
+def read_record(path: str, offset: int, length: int) -> Tuple[str, int, CaseInsensitiveDict, bytes]:
+    """(url, status, headers, body) of the archived response at offset in a segment."""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return parse_record(gzip.decompress(f.read(length)))
+
+
+def parse_record(data: bytes) -> Tuple[str, int, CaseInsensitiveDict, bytes]:
+    """Splits an uncompressed WARC response record into (url, status, headers, body)."""
+    warc_head, _, block = data.partition(b'\r\n\r\n')
+    url = ''
+    for line in warc_head.decode('utf-8', errors='replace').split('\r\n')[1:]:
+        name, _, value = line.partition(':')
+        if name.lower() == 'warc-target-uri':
+            url = value.strip()
+    http_head, _, body = block.partition(b'\r\n\r\n')
+    status_line, *header_lines = http_head.decode('latin-1').split('\r\n')
+    headers = CaseInsensitiveDict()
+    for line in header_lines:
+        name, _, value = line.partition(':')
+        headers[name.strip()] = value.strip()
+    parts = status_line.split(' ', 2)
+    status = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+    size = int(headers.get('Content-Length', len(body)))
+    return url, status, headers, body[:size]
+
+
+def iter_index(directory: str, latest_only: bool = True) -> Iterator[Tuple[str, str, int, int]]:
+    """(url, segment, offset, length) of archived pages in segment/offset order (only each URL's last copy)."""
+    conn = sqlite3.connect(os.path.join(directory, 'index.sqlite'))
+    try:
+        if latest_only:
+            query = """SELECT url, segment, offset, length FROM records
+                       WHERE rowid IN (SELECT MAX(rowid) FROM records GROUP BY url)
+                       ORDER BY segment, offset"""
+        else:
+            query = "SELECT url, segment, offset, length FROM records ORDER BY segment, offset"
+        yield from conn.execute(query)
+    finally:
+        conn.close()
+
+
+def _init_reprocess(save_path: str, parser: str, schema: Optional[ExtractionSchema], tables: Optional[str],
+                    table_format: str):
+    """Reprocess worker initializer: one extractor, compiled once, and output files of its own."""
+    global _worker_state
+    prefix = f"reprocessed_{os.getpid()}"
+    table_sink = TableSink(save_path, prefix=f"{prefix}_tables", fmt=table_format) if tables else None
+    sink = RecordSink(save_path, prefix=prefix)
+    _worker_state = (PageExtractor(parser, schema=schema, tables=tables), sink, table_sink)
+    Finalize(None, _close_reprocess, exitpriority=10)  # Runs as the worker exits at pool shutdown
+
+
+def _close_reprocess():
+    _, sink, table_sink = _worker_state
+    sink.close()
+    if table_sink is not None:
+        table_sink.close()
+
+
+def _reprocess_chunk(directory: str, segment: str, entries: List[Tuple[str, int, int]]) -> int:
+    """Re-extracts one run of records from a segment, reading it front to back."""
+    extractor, sink, table_sink = _worker_state
+    done = 0
+    with open(os.path.join(directory, segment), 'rb') as f:
+        for url, offset, length in entries:
+            try:
+                f.seek(offset)
+                _, status, headers, body = parse_record(gzip.decompress(f.read(length)))
+            except (OSError, EOFError, ValueError) as e:
+                print(f"Error reading {url} from {segment}@{offset}: {e}")
+                continue
+            if not 200 <= status < 300:
+                continue
+            extracted = extractor.extract(decode_body(body, _charset(headers.get('Content-Type', ''))), url)
+            data = {'url': url, 'links': extracted['links'], 'images': extracted['images'],
+                    'metadata': extracted['metadata']}
+            if extractor.schema:
+                data['fields'] = extracted['fields']
+            if table_sink is not None and extracted.get('tables'):
+                table_sink.write(url, extracted['tables'])
+                data['tables'] = len(extracted['tables'])
+            sink.write(data)
+            done += 1
+    sink.flush()  # The files stay open for the worker's next chunk
+    if table_sink is not None:
+        table_sink.flush()
+    return done
+
+
+def reprocess(directory: str, save_path: str, workers: Optional[int] = None, parser: str = 'auto',
+              schema: Optional[ExtractionSchema] = None, tables: Optional[str] = None, table_format: str = 'auto',
+              chunk_size: int = 500) -> int:
+    """Re-extracts every archived page into save_path with a pool of processes; returns the pages written."""
+    os.makedirs(save_path, exist_ok=True)
+    chunks: List[Tuple[str, List[Tuple[str, int, int]]]] = []
+    for url, segment, offset, length in iter_index(directory):
+        if not chunks or chunks[-1][0] != segment or len(chunks[-1][1]) >= chunk_size:
+            chunks.append((segment, []))
+        chunks[-1][1].append((url, offset, length))
+
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_reprocess,
+                             initargs=(save_path, parser, schema, tables, table_format)) as pool:
+        futures = [pool.submit(_reprocess_chunk, directory, segment, entries) for segment, entries in chunks]
+        for future in as_completed(futures):
+            total += future.result()
+    return total
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from extract import PARSERS
+    from sink import TABLE_FORMATS
+
+    parser = argparse.ArgumentParser(description='Raw page archive tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    command = commands.add_parser('reprocess', help='Re-run extraction over an archive, without the network')
+    command.add_argument('archive', type=str, help='Archive directory (save_path/archive of a crawl)')
+    command.add_argument('--save_path', type=str, default='./reprocessed_data', help='Directory for the output')
+    command.add_argument('--workers', type=int, default=None, help='Extraction processes (default: one per core)')
+    command.add_argument('--parser', type=str, default='auto', choices=PARSERS, help='HTML parser backend')
+    command.add_argument('--select', type=str, action='append', default=[], metavar='NAME=CSS',
+                         help='Extract the text of the first element matching CSS as field NAME (repeatable)')
+    command.add_argument('--schema', type=str, default=None, help='JSON extraction schema (see schema.py)')
+    command.add_argument('--tables', type=str, default=None, metavar='CSS',
+                         help='Extract the tables matching CSS into columnar files')
+    command.add_argument('--table_format', type=str, default='auto', choices=TABLE_FORMATS,
+                         help='Table output format (auto: parquet when pyarrow is installed, else csv)')
+
+    args = parser.parse_args()
+    schema = ExtractionSchema.from_selectors(dict(item.split('=', 1) for item in args.select))
+    if args.schema:
+        schema = schema.merge(ExtractionSchema.from_file(args.schema))
+
+    start = time.perf_counter()
+    pages = reprocess(args.archive, args.save_path, workers=args.workers, parser=args.parser,
+                      schema=schema if len(schema) else None, tables=args.tables, table_format=args.table_format)
+    elapsed = time.perf_counter() - start
+    print(f"Reprocessed {pages} pages in {elapsed:.1f}s ({pages / elapsed if elapsed else 0:.0f}/s) "
+          f"into {args.save_path}")
@@ -0,0 +1,182 @@
+# assets.py
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from politeness import HostScheduler, parse_retry_after
+from robots import RobotsCache
+from sink import RotatingFile
+from transport import Transport
+from urlindex import normalize_url
+
+# HEAD answers that say nothing about the asset; the GET is tried anyway
+HEAD_UNSUPPORTED = {403, 405, 501}
+
+
+class AssetDownloader:
+    """Downloads page assets (images by default) concurrently into content-addressed storage.
+
+    Each URL is fetched at most once per crawl, after a HEAD request has checked
+    its type and size where the server allows. Every request waits for its turn
+    in the crawl's HostScheduler, so assets share the pages' per-host interval,
+    Crawl-delay, 429/503 backoff and connection limit. Files are stored by the SHA-256
+    of their content under directory/ab/<sha256><ext>, so identical assets from
+    different URLs are kept once. Every download is listed in assets.NNNNN.jsonl
+    as {url, sha256, path, bytes, content_type}.
+    """
+
+    def __init__(self, directory: str, transport: Transport, scheduler: HostScheduler, workers: int = 4,
+                 max_bytes: int = 5 * 1024 * 1024, max_seconds: float = 30.0, types: Tuple[str, ...] = ('image/',),
+                 robots: Optional[RobotsCache] = None, headers: Optional[Callable[[], Dict[str, str]]] = None,
+                 metrics=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.transport = transport
+        self.scheduler = scheduler
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.types = types
+        self.robots = robots
+        self.headers = headers  # Request headers (the scraper's User-Agent), made fresh for every request
+        self.metrics = metrics
+        self.index = RotatingFile(directory, 'assets', 'jsonl', 100 * 1024 * 1024)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='asset')
+        self._seen: Set[str] = set()  # Every asset URL submitted in this crawl
+        self._pending: Dict[str, Future] = {}  # Downloads not finished yet
+        self._lock = threading.Lock()
+
+    def submit(self, page_url: str, sources: Iterable[str]) -> Dict[str, Future]:
+        """Queues the assets referenced by a page (src values, resolved against page_url), by URL.
+
+        The result includes assets still downloading for an earlier page, but not
+        ones that already finished.
+        """
+        futures = {}
+        with self._lock:
+            for source in sources:
+                url = normalize_url(source, page_url)  # Also drops data: URIs and other non-HTTP schemes
+                if url is None:
+                    continue
+                future = self._pending.get(url)
+                if future is None:
+                    if url in self._seen:
+                        continue
+                    self._seen.add(url)
+                    future = self._pending[url] = self.pool.submit(self._download, url)
+                    future.add_done_callback(lambda _, url=url: self._finished(url))
+                futures[url] = future
+        return futures
+
+    def _finished(self, url: str):
+        with self._lock:
+            self._pending.pop(url, None)
+
+    def _count(self, result: str):
+        if self.metrics is not None:
+            self.metrics.inc('assets', result=result)
+
+    def _accepts(self, response: requests.Response) -> bool:
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if self.types and not content_type.startswith(self.types):
+            return False
+        length = response.headers.get('Content-Length')
+        return not (length and length.isdigit() and int(length) > self.max_bytes)
+
+    def _request(self, method: Callable[..., requests.Response], url: str, **kwargs) -> requests.Response:
+        """One request in the host's turn; its outcome feeds the host's backoff like a page fetch would.
+
+        The host's slot stays taken until the caller has read the response and called scheduler.release().
+        """
+        self.scheduler.acquire(url)
+        start = time.monotonic()
+        try:
+            response = method(url, headers=self.headers() if self.headers else None, **kwargs)
+        except requests.RequestException:
+            self.scheduler.record(url, None, time.monotonic() - start)
+            raise
+        self.scheduler.record(url, response.status_code, time.monotonic() - start,
+                              parse_retry_after(response.headers.get('Retry-After')))
+        return response
+
+    def _download(self, url: str) -> Optional[Dict]:
+        """Fetches one asset; returns its index entry, or None when it was filtered out or failed."""
+        if self.robots is not None:
+            if not self.robots.allowed(url):
+                self._count('disallowed')
+                return None
+            if self.scheduler.claim_robots(url):
+                self.scheduler.set_crawl_delay(url, self.robots.crawl_delay(url))
+        try:
+            try:
+                head = self._request(self.transport.head, url)
+                head.close()
+            finally:
+                self.scheduler.release(url)
+            if head.status_code not in HEAD_UNSUPPORTED:
+                if head.status_code >= 400:
+                    self._count('error')
+                    return None
+                if not self._accepts(head):
+                    self._count('filtered')
+                    return None
+
+            try:
+                response = self._request(self.transport.get, url, stream=True)
+                if response.status_code >= 400 or not self._accepts(response):
+                    response.close()
+                    self._count('error' if response.status_code >= 400 else 'filtered')
+                    return None
+                body = self.transport.read_body(response, self.max_bytes, self.max_seconds)
+            finally:
+                self.scheduler.release(url)
+        except requests.RequestException as e:
+            print(f"Error downloading asset {url}: {e}")
+            self._count('error')
+            return None
+
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        digest, path, stored = self._store(url, content_type, body)
+        self._count('saved' if stored else 'duplicate')
+        entry = {'url': url, 'sha256': digest, 'path': path, 'bytes': len(body), 'content_type': content_type}
+        with self._lock:
+            self.index.write((json.dumps(entry) + '\n').encode('utf-8'))
+        return entry
+
+    def _store(self, url: str, content_type: str, body: bytes) -> Tuple[str, str, bool]:
+        """Writes body under its hash unless an identical file is already stored; returns (sha256, path, written)."""
+        digest = hashlib.sha256(body).hexdigest()
+        extension = mimetypes.guess_extension(content_type) or os.path.splitext(urlparse(url).path)[1][:8]
+        relative = os.path.join(digest[:2], digest + extension)
+        path = os.path.join(self.directory, relative)
+        if os.path.exists(path):
+            return digest, relative, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(body)
+        os.replace(temporary, path)  # Concurrent writers of the same content both end with one whole file
+        return digest, relative, True
+
+    @staticmethod
+    def results(futures: Dict[str, Future]) -> Dict[str, Optional[str]]:
+        """Waits for downloads from submit(); maps each asset URL to its stored path (None if skipped)."""
+        wait(futures.values())
+        results = {}
+        for url, future in futures.items():
+            entry = future.result()
+            results[url] = entry['path'] if entry else None
+        return results
+
+    def close(self):
+        """Waits for the queued downloads and closes the index."""
+        self.pool.shutdown(wait=True)
+        with self._lock:
+            self.index.close()
@@ -0,0 +1,72 @@
+# checkpoint.py
+import sqlite3
+import time
+from typing import Iterator, List, Optional, Tuple
+
+
+class CrawlStore:
+    """SQLite-backed copy of the crawl frontier and visited set, so a crawl can be resumed.
+
+    Changes are buffered in memory and committed in one transaction per checkpoint.
+    A URL stays in the frontier table until its page has been saved, so pages that
+    were in flight when the process died are fetched again on --resume. Each
+    frontier row keeps its best-first priority (None in a breadth-first crawl).
+    """
+
+    def __init__(self, path: str, interval: float = 30.0):
+        self.path = path
+        self.interval = interval
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS visited (url TEXT PRIMARY KEY)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS frontier (url TEXT PRIMARY KEY, depth INTEGER NOT NULL, "
+                          "priority REAL)")
+        self.conn.commit()
+        self._added: List[Tuple[str, int, Optional[float]]] = []
+        self._moved: List[Tuple[float, str]] = []
+        self._done: List[str] = []
+        self._last_checkpoint = time.monotonic()
+
+    def reset(self):
+        """Forgets any previous crawl stored at this path."""
+        self._added, self._moved, self._done = [], [], []
+        self.conn.execute("DELETE FROM visited")
+        self.conn.execute("DELETE FROM frontier")
+        self.conn.commit()
+
+    def visited(self) -> Iterator[str]:
+        """Streams the visited URLs from the table, so a resume never holds them all in memory at once."""
+        for (url,) in self.conn.execute("SELECT url FROM visited"):
+            yield url
+
+    def load(self) -> List[Tuple[str, int, Optional[float]]]:
+        """Returns the (url, depth, priority) rows still waiting to be fetched."""
+        return list(self.conn.execute("SELECT url, depth, priority FROM frontier ORDER BY depth"))
+
+    def add(self, url: str, depth: int, priority: Optional[float] = None):
+        """Records a URL that has been queued (and so counts as visited)."""
+        self._added.append((url, depth, priority))
+
+    def reprioritize(self, url: str, priority: float):
+        """Records a queued URL's new priority."""
+        self._moved.append((priority, url))
+
+    def done(self, url: str):
+        """Records that a queued URL has been fetched and saved."""
+        self._done.append(url)
+
+    def due(self) -> bool:
+        return time.monotonic() - self._last_checkpoint >= self.interval
+
+    def checkpoint(self):
+        """Commits everything recorded since the last checkpoint in one transaction."""
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO visited (url) VALUES (?)",
+                                  ((url,) for url, _, _ in self._added))
+            self.conn.executemany("INSERT OR IGNORE INTO frontier (url, depth, priority) VALUES (?, ?, ?)",
+                                  self._added)
+            self.conn.executemany("UPDATE frontier SET priority = ? WHERE url = ?", self._moved)
+            self.conn.executemany("DELETE FROM frontier WHERE url = ?", ((url,) for url in self._done))
+        self._added, self._moved, self._done = [], [], []
+        self._last_checkpoint = time.monotonic()
@@ -0,0 +1,211 @@
+# crawlbench.py
+"""Offline crawl benchmark: serves a generated site from local HTTP servers and crawls it with WebScraper."""
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+try:  # Unix only; CPU and RSS of parser processes are reported when available
+    import resource
+except ImportError:
+    resource = None
+
+from webscrap import WebScraper
+
+
+class SyntheticSite:
+    """A deterministic site graph of `pages` pages spread over `hosts` local servers."""
+
+    def __init__(self, pages: int = 1000, fanout: int = 10, page_kb: int = 20, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, error_rate: float = 0.0, hosts: int = 4, seed: int = 0):
+        self.pages = pages
+        self.fanout = fanout
+        self.page_kb = page_kb
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.hosts = hosts
+        rng = random.Random(seed)
+        # Page i links to its successor (so everything is reachable) plus random other pages
+        self.links = [[(i + 1) % pages] + [rng.randrange(pages) for _ in range(fanout - 1)] for i in range(pages)]
+        self.errors = {i for i in range(pages) if rng.random() < error_rate}
+        self.servers: List[ThreadingHTTPServer] = []
+
+    def url(self, page: int) -> str:
+        server = self.servers[page % self.hosts]
+        return f"http://127.0.0.1:{server.server_port}/page/{page}"
+
+    def render(self, page: int) -> bytes:
+        links = ''.join(f'<li><a href="{self.url(target)}?utm_source=bench">Page {target}</a></li>'
+                        for target in self.links[page])
+        words = random.Random(page).choices(['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'crawl', 'page', 'bench'],
+                                            k=self.page_kb * 170)
+        return (f'<html><head><title>Page {page}</title><meta name="description" content="Page {page}">'
+                f'</head><body><h1>Page {page}</h1><p>{page} {" ".join(words)}</p>'
+                f'<img src="/img/{page % 50}.png"><ul>{links}</ul></body></html>').encode('utf-8')
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like real servers
+
+            def do_GET(self):
+                if site.latency or site.jitter:
+                    time.sleep(site.latency + random.random() * site.jitter)
+                parts = self.path.split('?')[0].strip('/').split('/')
+                page = int(parts[1]) if len(parts) == 2 and parts[0] == 'page' and parts[1].isdigit() else None
+                if page is None or page >= site.pages:
+                    self._send(404, b'not found', 'text/plain')
+                elif page in site.errors:
+                    self._send(500, b'error', 'text/plain')
+                else:
+                    self._send(200, site.render(page), 'text/html; charset=utf-8')
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        for _ in range(self.hosts):
+            server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers.append(server)
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+class TimedScraper(WebScraper):
+    """WebScraper that records the fetch latency of every page, from the request until its body is read."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies: List[float] = []
+
+    def download_body(self, url: str):
+        start = time.perf_counter()  # Responses are streamed, so request() alone would stop at the headers
+        try:
+            return super().download_body(url)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _usage():
+    """(CPU seconds, peak RSS in MB) of this process and its finished children."""
+    if resource is None:
+        return time.process_time(), None
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = self_usage.ru_utime + self_usage.ru_stime + child_usage.ru_utime + child_usage.ru_stime
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+    return cpu, max(self_usage.ru_maxrss, child_usage.ru_maxrss) / scale
+
+
+def run_benchmark(site: SyntheticSite, **scraper_options) -> Dict[str, float]:
+    """Crawls the site once and returns throughput, latency, CPU and memory figures."""
+    site.start()
+    try:
+        with tempfile.TemporaryDirectory() as save_path:
+            options = dict(depth=site.pages, delay=0.0, dedupe_distance=-1)
+            options.update(scraper_options)
+            scraper = TimedScraper(site.url(0), save_path=save_path, **options)
+            cpu_before, _ = _usage()
+            start = time.perf_counter()
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                scraper.crawl()
+            elapsed = time.perf_counter() - start
+            cpu_after, peak_rss = _usage()
+            saved = scraper.sink.written
+            transport = scraper.transport.stats()
+            scraper.transport.close()
+    finally:
+        site.stop()
+
+    return {
+        'pages': saved,
+        'requests': len(scraper.latencies),
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(saved / elapsed, 2) if elapsed else 0.0,
+        'fetch_p50_ms': round(percentile(scraper.latencies, 50) * 1000, 2),
+        'fetch_p99_ms': round(percentile(scraper.latencies, 99) * 1000, 2),
+        'cpu_ms_per_page': round((cpu_after - cpu_before) / saved * 1000, 3) if saved else 0.0,
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+        'connection_reuse': round(transport['reuse_ratio'], 3),
+    }
+
+
+def compare(result: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Describes every metric that regressed by more than tolerance against the baseline."""
+    regressions = []
+    higher_is_better = {'pages_per_second'}
+    for key in ('pages_per_second', 'fetch_p50_ms', 'fetch_p99_ms', 'cpu_ms_per_page', 'peak_rss_mb'):
+        old, new = baseline.get(key), result.get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (key in higher_is_better and change < -tolerance) or (key not in higher_is_better and change > tolerance):
+            regressions.append(f"{key}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Offline WebScraper benchmark against a synthetic local site')
+    parser.add_argument('--pages', type=int, default=1000, help='Pages in the generated site')
+    parser.add_argument('--fanout', type=int, default=10, help='Links per page')
+    parser.add_argument('--page_kb', type=int, default=20, help='Approximate size of each page in KB')
+    parser.add_argument('--latency_ms', type=float, default=0.0, help='Delay the server adds to every response')
+    parser.add_argument('--jitter_ms', type=float, default=0.0, help='Random extra delay of up to this many ms')
+    parser.add_argument('--error_rate', type=float, default=0.0, help='Fraction of pages answering HTTP 500')
+    parser.add_argument('--hosts', type=int, default=4, help='Local servers (crawl hosts) the site is spread over')
+    parser.add_argument('--concurrency', type=int, default=8, help='Fetcher threads')
+    parser.add_argument('--parse_workers', type=int, default=None, help='Parser processes (0 parses inline)')
+    parser.add_argument('--parser', type=str, default='auto', help='HTML parser backend')
+    parser.add_argument('--output', type=str, help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', type=str, help='JSON results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed relative regression (0.1 = 10%%)')
+
+    args = parser.parse_args()
+
+    site = SyntheticSite(pages=args.pages, fanout=args.fanout, page_kb=args.page_kb, latency_ms=args.latency_ms,
+                         jitter_ms=args.jitter_ms, error_rate=args.error_rate, hosts=args.hosts)
+    result = run_benchmark(site, concurrency=args.concurrency, parse_workers=args.parse_workers, parser=args.parser)
+    for key, value in result.items():
+        print(f"{key:>18}: {value}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"Regression: {line}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,73 @@
+# dedupe.py
+import hashlib
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def simhash(text: str, ngram: int = 3) -> Optional[int]:
+    """64-bit SimHash of the word n-grams in text, or None when there is no text."""
+    words = WORD.findall(text.lower())
+    if not words:
+        return None
+    if len(words) < ngram:
+        shingles = Counter(words)
+    else:
+        shingles = Counter(' '.join(words[i:i + ngram]) for i in range(len(words) - ngram + 1))
+
+    weights = [0] * 64
+    for shingle, count in shingles.items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        for bit in range(64):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """Finds stored signatures within `max_distance` bits of a new one.
+
+    Signatures are split into max_distance + 1 bands; two signatures that differ
+    in at most max_distance bits must share at least one band exactly, so only
+    pages in the same band buckets are compared.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self._widths = [64 // self.bands + (1 if i < 64 % self.bands else 0) for i in range(self.bands)]
+        self._buckets: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+
+    def _keys(self, signature: int):
+        shift = 0
+        for width in self._widths:
+            yield signature >> shift & ((1 << width) - 1)
+            shift += width
+
+    def find(self, signature: int) -> Optional[str]:
+        """URL of a stored near-duplicate of signature, if any."""
+        with self._lock:
+            return self._find(signature)
+
+    def _find(self, signature: int) -> Optional[str]:
+        for buckets, key in zip(self._buckets, self._keys(signature)):
+            for other, url in buckets.get(key, ()):
+                if hamming(signature, other) <= self.max_distance:
+                    return url
+        return None
+
+    def add_or_find(self, signature: int, url: str) -> Optional[str]:
+        """Returns the URL this page duplicates, or stores it and returns None."""
+        with self._lock:
+            original = self._find(signature)
+            if original is None:
+                for buckets, key in zip(self._buckets, self._keys(signature)):
+                    buckets.setdefault(key, []).append((signature, url))
+            return original
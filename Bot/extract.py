@@ -0,0 +1,205 @@
+# extract.py
+import time
+from typing import Dict, List, Optional, Union
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from bs4.element import PreformattedString
+import soupsieve
+
+from dedupe import simhash
+from schema import ExtractionSchema
+from tables import parse_table, selectolax_rows, soup_rows
+from urlindex import normalize_url
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser  # selectolax < 1.0 (Modest backend)
+    except ImportError:
+        HTMLParser = None
+
+PARSERS = ['auto', 'html.parser', 'lxml', 'selectolax']
+NON_CONTENT_TAGS = {'script', 'style', 'noscript', 'template'}
+_worker_extractor = None  # Built once per parser process by init_worker()
+
+
+def resolve_parser(parser: str = 'auto') -> str:
+    """Picks the fastest installed backend for 'auto' and checks explicit choices are installed."""
+    if parser == 'auto':
+        if HTMLParser is not None:
+            return 'selectolax'
+        return 'lxml' if HAS_LXML else 'html.parser'
+    if parser == 'selectolax' and HTMLParser is None:
+        raise ValueError("The selectolax parser needs `pip install -U selectolax` (its Lexbor backend).")
+    if parser == 'lxml' and not HAS_LXML:
+        raise ValueError("The lxml parser needs `pip install lxml`.")
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser '{parser}'. Choose one of: {', '.join(PARSERS)}")
+    return parser
+
+
+class PageExtractor:
+    """Collects links, images, meta tags, schema fields and tables in a single walk over the DOM."""
+
+    def __init__(self, parser: str = 'auto', selectors: Optional[Dict[str, str]] = None, fingerprint: bool = False,
+                 schema: Optional[ExtractionSchema] = None, tables: Optional[str] = None):
+        self.parser = resolve_parser(parser)
+        self.fingerprint = fingerprint  # Add a 'simhash' of the visible text for near-duplicate detection
+        # BeautifulSoup is still used for fetch_page()/self.soup, so it needs a bs4 tree builder
+        self.soup_parser = 'lxml' if HAS_LXML else 'html.parser'
+        # NAME=CSS selectors are plain text fields of the schema
+        self.schema = ExtractionSchema.from_selectors(selectors).merge(schema)
+        self._compiled = self.schema.compile(self.parser)
+        self._soup_compiled = self._compiled if self.parser != 'selectolax' else None  # For extract_fields()
+        self.tables = tables  # CSS selector of the <table>s to extract into 'tables'
+        self._table_match = None  # selectolax matches against the page's tree.css(tables) instead
+        if tables and self.parser != 'selectolax':
+            self._table_match = soupsieve.compile(tables).match
+
+    def make_soup(self, html: Union[str, bytes]) -> BeautifulSoup:
+        """Parses html into a BeautifulSoup tree."""
+        return BeautifulSoup(html, self.soup_parser)
+
+    def extract_fields(self, soup: BeautifulSoup, base: Optional[str] = None) -> Dict:
+        """The schema's typed row for an already parsed page (see fetch_page)."""
+        if self._soup_compiled is None:
+            self._soup_compiled = self.schema.compile(self.soup_parser)
+        row = self._soup_compiled.row()
+        for tag in soup.find_all(True):
+            row.visit(tag.name, tag)
+        return row.finish(base)
+
+    def extract(self, html: Union[str, bytes], url: Optional[str] = None) -> Dict:
+        """Returns {'links', 'images', 'metadata', 'fields'} (and 'simhash' if fingerprinting) for one page.
+
+        Links are resolved against url (or the page's <base href>) and normalized.
+        With a tables selector, 'tables' holds each matching table as
+        {'columns', 'rows'} (see tables.parse_table).
+        """
+        if self.parser == 'selectolax':
+            return self._extract_selectolax(html, url)
+        return self._extract_soup(BeautifulSoup(html, self.parser), url)
+
+    def _extract_soup(self, soup: BeautifulSoup, base: Optional[str]) -> Dict:
+        links: List[str] = []
+        images: List[str] = []
+        metadata: Dict[str, str] = {}
+        row = self._compiled.row()
+        tables = []
+
+        for tag in soup.find_all(True):
+            name = tag.name
+            if name == 'a':
+                href = tag.get('href')
+                link = normalize_url(href, base) if href else None
+                if link:
+                    links.append(link)
+            elif name == 'img':
+                src = tag.get('src')
+                if src:
+                    images.append(src)
+            elif name == 'meta':
+                key = tag.get('name') or tag.get('property')
+                content = tag.get('content')
+                if key and content:
+                    metadata[key] = content
+            elif name == 'base' and tag.get('href'):
+                base = urljoin(base or '', tag['href'])
+
+            if name == 'table' and self._table_match is not None and self._table_match(tag):
+                tables.append(tag)
+            row.visit(name, tag)
+
+        result = {'links': links, 'images': images, 'metadata': metadata, 'fields': row.finish(base)}
+        if self.tables:
+            result['tables'] = [parse_table(soup_rows(table)) for table in tables]
+        if self.fingerprint:
+            text = ' '.join(string for string in soup.find_all(string=True)
+                            if not isinstance(string, PreformattedString)
+                            and string.parent.name not in NON_CONTENT_TAGS)
+            result['simhash'] = simhash(text)
+        return result
+
+    def _extract_selectolax(self, html: str, base: Optional[str]) -> Dict:
+        links: List[str] = []
+        images: List[str] = []
+        metadata: Dict[str, str] = {}
+        tables = []
+
+        tree = HTMLParser(html)
+        if tree.root is None:
+            result = {'links': links, 'images': images, 'metadata': metadata,
+                      'fields': self._compiled.row().finish(base)}
+            if self.tables:
+                result['tables'] = []
+            if self.fingerprint:
+                result['simhash'] = None
+            return result
+        row = self._compiled.row(tree)
+        # By node identity: css_matches() would also accept every table that contains a matching one
+        table_ids = {node.mem_id for node in tree.css(self.tables)} if self.tables else set()
+
+        for node in tree.root.traverse():
+            name = node.tag
+            if name == 'a':
+                href = node.attributes.get('href')
+                link = normalize_url(href, base) if href else None
+                if link:
+                    links.append(link)
+            elif name == 'img':
+                src = node.attributes.get('src')
+                if src:
+                    images.append(src)
+            elif name == 'meta':
+                attrs = node.attributes
+                key = attrs.get('name') or attrs.get('property')
+                content = attrs.get('content')
+                if key and content:
+                    metadata[key] = content
+            elif name == 'base' and node.attributes.get('href'):
+                base = urljoin(base or '', node.attributes['href'])
+
+            if name == 'table' and node.mem_id in table_ids:
+                tables.append(node)
+            row.visit(name, node)
+
+        result = {'links': links, 'images': images, 'metadata': metadata, 'fields': row.finish(base)}
+        if self.tables:
+            result['tables'] = [parse_table(selectolax_rows(table)) for table in tables]
+        if self.fingerprint:
+            tree.strip_tags(list(NON_CONTENT_TAGS))
+            result['simhash'] = simhash((tree.body or tree.root).text(separator=' '))
+        return result
+
+
+def decode_body(body: bytes, encoding: Optional[str]) -> Union[str, bytes]:
+    """Decodes a response body with its declared charset; without one the parser sniffs the bytes."""
+    if encoding:
+        try:
+            return body.decode(encoding, errors='replace')
+        except LookupError:
+            pass
+    return body
+
+
+def init_worker(parser: str, schema: Optional[ExtractionSchema], fingerprint: bool = False,
+                tables: Optional[str] = None):
+    """ProcessPoolExecutor initializer that builds the worker's extractor, and compiles its schema, once."""
+    global _worker_extractor
+    _worker_extractor = PageExtractor(parser, fingerprint=fingerprint, schema=schema, tables=tables)
+
+
+def extract_in_worker(body: bytes, encoding: Optional[str], url: str) -> Dict:
+    """Parses one fetched page inside a parser process; 'parse_seconds' reports the time taken."""
+    start = time.perf_counter()
+    result = _worker_extractor.extract(decode_body(body, encoding), url)
+    result['parse_seconds'] = time.perf_counter() - start
+    return result
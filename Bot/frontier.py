@@ -0,0 +1,107 @@
+# frontier.py
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from politeness import host_of
+from urlindex import fingerprint
+
+# URL pattern rules applied by default: (regex, score added); boilerplate links sink to the back
+DEFAULT_RULES: List[Tuple[str, float]] = [
+    (r'/(login|log-in|signin|sign-in|signup|sign-up|register|logout|cart|checkout|account)\b', -3.0),
+    (r'/(privacy|terms|cookies?|legal|disclaimer|imprint)\b', -2.0),
+    (r'[?&](share|replytocom|sort|order|filter|lang|print)=', -2.0),
+    (r'/(tag|tags|author|feed|rss|comments?|page/\d+)/', -1.0),
+    (r'://([^/]+\.)?(facebook|twitter|x|linkedin|instagram|pinterest|reddit|tiktok|youtube)\.com/', -3.0),
+]
+
+
+def parse_rule(spec: str) -> Tuple[str, float]:
+    """A REGEX=WEIGHT rule from the command line (the weight is split off the last '=')."""
+    pattern, _, weight = spec.rpartition('=')
+    return pattern, float(weight)
+
+
+class LinkGraph:
+    """In-link counts and OPIC importance of discovered URLs, keyed by 64-bit URL fingerprints.
+
+    OPIC (Abiteboul et al.) is an online PageRank estimate: every seed starts
+    with one unit of cash, and a fetched page hands its cash out in equal shares
+    to the pages it links to. A queued page's accumulated cash approximates its
+    PageRank without ever iterating over the whole graph. The edges themselves
+    are kept on disk in the links CSV written by RecordSink.
+    """
+
+    def __init__(self):
+        self.in_links: Dict[int, int] = {}
+        self.cash: Dict[int, float] = {}
+        self.total_cash = 0.0
+        self._lock = threading.Lock()
+
+    def seed(self, url: str, cash: float = 1.0):
+        with self._lock:
+            key = fingerprint(url)
+            self.cash[key] = self.cash.get(key, 0.0) + cash
+            self.total_cash += cash
+
+    def add_page(self, url: str, links: Iterable[str]):
+        """Counts a fetched page's links and distributes its cash over them."""
+        targets = {fingerprint(link) for link in links}
+        targets.discard(fingerprint(url))
+        with self._lock:
+            share = self.cash.pop(fingerprint(url), 0.0)
+            self.total_cash -= share
+            share = share / len(targets) if targets else 0.0
+            for key in targets:
+                self.in_links[key] = self.in_links.get(key, 0) + 1
+                self.cash[key] = self.cash.get(key, 0.0) + share
+            self.total_cash += share * len(targets)
+
+    def stats(self, url: str) -> Tuple[int, float, float]:
+        """(in-links, cash, mean cash of the pages holding any) for url."""
+        key = fingerprint(url)
+        with self._lock:
+            mean = self.total_cash / len(self.cash) if self.cash else 0.0
+            return self.in_links.get(key, 0), self.cash.get(key, 0.0), mean
+
+
+class FrontierScorer:
+    """Scores URLs for a best-first crawl; HostScheduler fetches the lowest priority (= -score) first.
+
+    score = inlink_weight * log2(1 + in-links)
+          + cash_weight * log2(1 + cash / mean cash)      (OPIC, see LinkGraph)
+          - depth_weight * depth
+          - host_weight * log2(1 + pages already queued from the host)
+          + the weights of every matching URL pattern rule
+    """
+
+    def __init__(self, depth_weight: float = 1.0, inlink_weight: float = 1.0, cash_weight: float = 1.0,
+                 host_weight: float = 0.5, rules: Optional[List[Tuple[str, float]]] = None):
+        self.depth_weight = depth_weight
+        self.inlink_weight = inlink_weight
+        self.cash_weight = cash_weight
+        self.host_weight = host_weight
+        self.rules = [(re.compile(pattern, re.IGNORECASE), weight)
+                      for pattern, weight in (DEFAULT_RULES if rules is None else rules)]
+        self.graph = LinkGraph()
+        self.host_pages: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def rule_score(self, url: str) -> float:
+        return sum(weight for pattern, weight in self.rules if pattern.search(url))
+
+    def priority(self, url: str, depth: int) -> float:
+        in_links, cash, mean_cash = self.graph.stats(url)
+        score = self.inlink_weight * math.log2(1 + in_links) - self.depth_weight * depth + self.rule_score(url)
+        if mean_cash > 0:
+            score += self.cash_weight * math.log2(1 + cash / mean_cash)
+        with self._lock:
+            score -= self.host_weight * math.log2(1 + self.host_pages.get(host_of(url), 0))
+        return -score
+
+    def queued(self, url: str):
+        """Counts a newly queued URL against its host's diversity allowance."""
+        host = host_of(url)
+        with self._lock:
+            self.host_pages[host] = self.host_pages.get(host, 0) + 1
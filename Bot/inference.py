@@ -0,0 +1,126 @@
+# inference.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+# torch: fp32 as downloaded; int8: Linear layers dynamically quantized; onnx: exported to ONNX Runtime
+BACKENDS = ('torch', 'int8', 'onnx')
+# How correct_english uses its two grammar models: one of them, or both in parallel
+GRAMMAR_MODES = ('t5', 'bart', 'both')
+
+# Pipeline tasks (before any _xx_to_yy suffix) and the optimum ONNX Runtime class for their models
+ORT_MODELS = {
+    'text2text-generation': 'ORTModelForSeq2SeqLM',
+    'translation': 'ORTModelForSeq2SeqLM',
+    'summarization': 'ORTModelForSeq2SeqLM',
+    'conversational': 'ORTModelForCausalLM',
+    'text-generation': 'ORTModelForCausalLM',
+}
+# The checkpoints transformers picks when a pipeline is built without a model; ONNX export needs a name
+DEFAULT_MODELS = {
+    'translation_en_to_fr': 't5-base',
+}
+
+
+def default_threads() -> int:
+    """$JARVIS_THREADS, else half the logical cores (i.e. the physical ones)."""
+    return int(os.environ.get('JARVIS_THREADS', 0)) or max(1, (os.cpu_count() or 2) // 2)
+
+
+def configure_threads(threads: Optional[int] = None) -> int:
+    """Sets the CPU threads torch uses per operation (default: default_threads())."""
+    threads = threads or default_threads()
+    os.environ.setdefault('OMP_NUM_THREADS', str(threads))  # Read by OpenMP when torch is first imported
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)  # Requests are already run one per inference lane
+    except RuntimeError:  # Only allowed before the first parallel operation
+        pass
+    return threads
+
+
+def quantize(model):
+    """Dynamic int8 quantization of a model's Linear layers, in place: weights shrink 4x, matmuls run in int8."""
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def _onnx_pipeline(task: str, model: Optional[str]):
+    import optimum.onnxruntime as ort
+    from transformers import AutoTokenizer, pipeline
+
+    name = model or DEFAULT_MODELS.get(task)
+    model_class = getattr(ort, ORT_MODELS[task.split('_')[0]])
+    return pipeline(task, model=model_class.from_pretrained(name, export=True),
+                    tokenizer=AutoTokenizer.from_pretrained(name))
+
+
+def build_pipeline(task: str, model: Optional[str] = None, backend: str = 'int8', threads: Optional[int] = None):
+    """A transformers pipeline for CPU inference with the given backend.
+
+    ONNX needs optimum[onnxruntime] and a model architecture it can export;
+    otherwise the int8 torch backend is used instead.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    configure_threads(threads)
+    if backend == 'onnx':
+        try:
+            pipe = _onnx_pipeline(task, model)
+            pipe.backend = backend
+            return pipe
+        except (ImportError, KeyError, ValueError, RuntimeError, OSError) as e:  # Missing, unexportable or broken
+            print(f"ONNX Runtime is unavailable for {model or task} ({e}); using int8 instead.")
+            backend = 'int8'
+
+    from transformers import pipeline
+
+    pipe = pipeline(task, model=model or DEFAULT_MODELS.get(task), device=-1)
+    if backend == 'int8':
+        pipe.model = quantize(pipe.model.eval())
+    pipe.backend = backend  # What actually runs, after any fallback
+    return pipe
+
+
+def cached_revision(model: str) -> str:
+    """The hub commit of a model in the local Hugging Face cache, or '' if it hasn't been downloaded."""
+    hub = os.environ.get('HF_HUB_CACHE') or os.path.join(
+        os.environ.get('HF_HOME') or os.path.join(os.path.expanduser('~'), '.cache', 'huggingface'), 'hub')
+    try:
+        with open(os.path.join(hub, 'models--' + model.replace('/', '--'), 'refs', 'main')) as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def model_version(task: str, model: Optional[str] = None, backend: str = 'int8') -> str:
+    """Identifies the weights a pipeline runs (checkpoint, hub revision, backend) without loading it,
+    e.g. to invalidate cached outputs."""
+    name = model or DEFAULT_MODELS.get(task) or task
+    return f"{name}@{cached_revision(name)}/{backend}"
+
+
+def run_parallel(*calls: Callable[[], Any], threads: Optional[int] = None) -> List[Any]:
+    """Runs the calls at the same time (torch releases the GIL while it computes); results in call order.
+
+    The CPU threads (default: default_threads()) are split between the calls,
+    so running them side by side does not oversubscribe the cores.
+    """
+    import torch
+
+    threads = threads or default_threads()
+    share = max(1, threads // len(calls))
+
+    def run(call):
+        torch.set_num_threads(share)  # Applies to the operations this worker thread starts
+        return call()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix='parallel') as pool:
+            futures = [pool.submit(run, call) for call in calls]
+            return [future.result() for future in futures]
+    finally:
+        torch.set_num_threads(threads)
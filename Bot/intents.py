@@ -0,0 +1,114 @@
+# intents.py
+import re
+from typing import Dict, Iterable, List, Optional, Union
+
+COLORS = ('red', 'green', 'blue', 'white', 'yellow', 'purple', 'orange', 'pink')
+TARGETS = ('light', 'lights', 'bulb', 'lamp')
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """One regex alternation for many phrases, factored into a word trie.
+
+    Phrases sharing leading words share one branch, so matching at a position
+    costs the length of the longest phrase rather than the number of phrases.
+    Longer phrases win: optional continuations are greedy.
+    """
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for word in phrase.lower().split():
+            node = node.setdefault(word, {})
+        node[''] = True  # A phrase ends here
+
+    def build(node: Dict) -> str:
+        branches = []
+        for word in sorted((w for w in node if w), key=len, reverse=True):
+            child = node[word]
+            rest = build(child)
+            if rest:
+                rest = rf'(?:\s+{rest})' + ('?' if '' in child else '')
+            branches.append(re.escape(word) + rest)
+        if not branches:
+            return ''
+        return branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+
+    return build(trie) or '(?!)'  # No phrases: never matches
+
+
+class IntentMatch:
+    """A recognized intent: the phrase that triggered it, the text after it, and the slots right after the phrase."""
+
+    def __init__(self, name: str, phrase: str, start: int, end: int, rest: str,
+                 slots: Dict[str, List[Union[str, int, float]]]):
+        self.name = name
+        self.phrase = phrase
+        self.start = start
+        self.end = end
+        self.rest = rest  # Free text after the phrase, e.g. the word in "pronounce <word>"
+        self.slots = slots
+        self.score = len(phrase)  # The more specific (longer) trigger phrase ranks first
+
+    def slot(self, name: str, default=None):
+        """The first value of a slot (number, color or target), or default."""
+        values = self.slots.get(name)
+        return values[0] if values else default
+
+    def __repr__(self):
+        return f"IntentMatch({self.name!r}, phrase={self.phrase!r}, slots={self.slots!r})"
+
+
+class IntentMatcher:
+    """Finds command intents and their slots in one left-to-right regex pass.
+
+    Every trigger phrase of every intent is compiled into a single
+    case-insensitive regex, with the phrases factored into a word trie. Phrases
+    only match whole words, so "turn on" does not fire inside "return only".
+    The same pattern takes up to `slot_words` words after a phrase, stopping at
+    the next phrase, and an intent's slots (numbers, colors, target words) are
+    read from those words only: in "turn on the light and set brightness to 50"
+    the 50 belongs to set brightness. Slot words inside a matched phrase
+    ("turn on the light") belong to the phrase.
+    """
+
+    def __init__(self, intents: Dict[str, Iterable[str]], colors: Iterable[str] = COLORS,
+                 targets: Iterable[str] = TARGETS, slot_words: int = 6):
+        self.phrases: Dict[str, str] = {}  # Normalized phrase -> intent
+        for name, phrases in intents.items():
+            for phrase in phrases:
+                key = ' '.join(phrase.lower().split())
+                if self.phrases.setdefault(key, name) != name:
+                    raise ValueError(f"Phrase '{phrase}' is used by intents '{self.phrases[key]}' and '{name}'")
+        phrases = _trie_pattern(self.phrases)
+        self.pattern = re.compile(
+            rf"\b(?P<phrase>{phrases})\b(?P<args>(?:\W+(?!(?:{phrases})\b)\w+(?:\.\d+)?){{0,{slot_words}}})",
+            re.IGNORECASE)
+        self.slot_pattern = re.compile(
+            rf"(?:(?P<number>(?<![\w.])[-+]?\d+(?:\.\d+)?)"
+            rf"|\b(?P<color>{_trie_pattern(colors)})"
+            rf"|\b(?P<target>{_trie_pattern(targets)}))\b",
+            re.IGNORECASE)
+
+    def parse(self, text: str) -> List[IntentMatch]:
+        """Every intent found in text, best first (longest trigger phrase, then earliest)."""
+        found: Dict[str, IntentMatch] = {}
+        for match in self.pattern.finditer(text):
+            slots: Dict[str, List[Union[str, int, float]]] = {}
+            for slot in self.slot_pattern.finditer(match.group('args')):
+                kind = slot.lastgroup
+                value = slot.group(kind)
+                if kind == 'number':
+                    slots.setdefault('number', []).append(float(value) if '.' in value else int(value))
+                else:
+                    slots.setdefault(kind, []).append(value.lower())
+            phrase = ' '.join(match.group('phrase').lower().split())
+            name = self.phrases[phrase]
+            end = match.end('phrase')
+            intent = IntentMatch(name, phrase, match.start(), end, text[end:].strip(), slots)
+            if name not in found or intent.score > found[name].score:
+                found[name] = intent
+        return sorted(found.values(), key=lambda intent: (-intent.score, intent.start))
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        """The best intent in text, or None."""
+        intents = self.parse(text)
+        return intents[0] if intents else None
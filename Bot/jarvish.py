@@ -1,172 +1,297 @@
-import tkinter as tk
-from tkinter import messagebox, colorchooser
-import speech_recognition as sr
-import pyttsx3
-import spacy
-from nltk.corpus import cmudict
-from textblob import TextBlob
-import requests
-import random
-import threading
-import torch
-from transformers import pipeline
-
-# Ensure necessary NLTK data is downloaded
-import nltk
-nltk.download('cmudict')
-nltk.download('wordnet')
-
-class AIJarvis:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("AI Jarvis")
-        self.root.geometry("600x400")
-
-        # Initialize recognizer and TTS engine
-        self.recognizer = sr.Recognizer()
-        self.tts_engine = pyttsx3.init()
-        self.nlp = spacy.load("en_core_web_sm")
-        self.pronouncing_dict = cmudict.dict()
-       
-        self.grammar_checker_bart = pipeline("text2text-generation", model="facebook/bart-large-mnli")
-
-        # Create GUI components
-        self.create_widgets()
-        
-    def create_widgets(self):
-        """Create GUI components."""
-        self.output_area = tk.Text(self.root, height=10, width=70)
-        self.output_area.pack(pady=10)
-
-        self.input_entry = tk.Entry(self.root, width=50)
-        self.input_entry.pack(pady=10)
-
-        self.send_button = tk.Button(self.root, text="Send", command=self.process_command_from_entry)
-        self.send_button.pack(pady=10)
-
-        self.listen_button = tk.Button(self.root, text="Listen", command=self.listen)
-        self.listen_button.pack(pady=10)
-
-        self.color_button = tk.Button(self.root, text="Change Bulb Color", command=self.change_color)
-        self.color_button.pack(pady=10)
-
-        self.bulb_on_button = tk.Button(self.root, text="Turn Bulb ON", command=lambda: self.control_wipro_bulb("on"))
-        self.bulb_on_button.pack(pady=10)
-
-        self.bulb_off_button = tk.Button(self.root, text="Turn Bulb OFF", command=lambda: self.control_wipro_bulb("off"))
-        self.bulb_off_button.pack(pady=10)
-
-    def speak(self, text):
-        """Convert text to speech output."""
-        self.tts_engine.say(text)
-        self.tts_engine.runAndWait()
-        self.output_area.insert(tk.END, f"Jarvis: {text}\n")
-        self.output_area.see(tk.END)
-
-    def listen(self):
-        """Listen to the user and return recognized text."""
-        with sr.Microphone() as source:
-            self.output_area.insert(tk.END, "Listening...\n")
-            self.root.update()  # Update GUI
-            audio = self.recognizer.listen(source)
-            try:
-                text = self.recognizer.recognize_google(audio)
-                self.output_area.insert(tk.END, f"You: {text}\n")
-                self.root.update()  # Update GUI
-                self.process_command(text)
-            except sr.UnknownValueError:
-                self.speak("Sorry, I didn't catch that.")
-            except sr.RequestError:
-                self.speak("Service is down.")
-
-    def process_command_from_entry(self):
-        """Process command from input entry."""
-        command = self.input_entry.get()
-        self.output_area.insert(tk.END, f"You: {command}\n")
-        self.input_entry.delete(0, tk.END)
-        self.process_command(command)
-
-    def process_command(self, command):
-        """Identify and execute commands based on user input."""
-        if "teach me English" in command:
-            self.teach_english()
-        elif "pronounce" in command:
-            word = command.split("pronounce")[-1].strip()
-            self.pronunciation_help(word)
-        elif "correct my sentence" in command:
-            self.speak("Please say the sentence you want me to correct.")
-            self.listen()
-        elif "turn bulb" in command:
-            if "on" in command:
-                self.control_wipro_bulb("on")
-            elif "off" in command:
-                self.control_wipro_bulb("off")
-        elif "change color" in command:
-            self.change_color()
-        elif "suggest a vocabulary word" in command:
-            self.suggest_vocabulary()
-        else:
-            self.speak("I didn't understand that command.")
-
-    def correct_english(self, sentence):
-        """Analyze and correct the grammar of a given sentence using a deep learning model."""
-        # Using T5 model
-        corrected_sentence_t5 = self.grammar_checker_t5(sentence)[0]['generated_text']
-        # Using BART model
-        corrected_sentence_bart = self.grammar_checker_bart(sentence)[0]['generated_text']
-        return corrected_sentence_t5, corrected_sentence_bart
-
-    def teach_english(self):
-        """A method to engage in English conversation practice."""
-        self.speak("Let's practice English! Say something, and I'll help you improve.")
-        self.listen()
-
-    def pronunciation_help(self, word):
-        """Provide pronunciation help using CMU Pronouncing Dictionary."""
-        pronunciation = self.pronouncing_dict.get(word.lower())
-        if pronunciation:
-            phonetic = ' '.join(pronunciation[0])
-            self.speak(f"The pronunciation of '{word}' is: {phonetic}")
-        else:
-            self.speak(f"Sorry, I couldn't find the pronunciation for '{word}'.")
-
-    def control_wipro_bulb(self, state):
-        """Turn the Wipro bulb on or off."""
-        bulb_api_url = "http://<bulb-ip>/api"  # Replace with actual IP and API endpoint
-        try:
-            if state.lower() == "on":
-                response = requests.post(f"{bulb_api_url}/turn_on")
-                self.speak("Turning the bulb on.")
-            elif state.lower() == "off":
-                response = requests.post(f"{bulb_api_url}/turn_off")
-                self.speak("Turning the bulb off.")
-            if response.status_code != 200:
-                self.speak("Failed to control the bulb. Check your network and try again.")
-        except Exception as e:
-            self.speak("There was an error connecting to the bulb.")
-
-    def change_color(self):
-        """Change the color of the smart bulb."""  
-        color = colorchooser.askcolor()[1]  # Show color picker
-        if color:
-            bulb_api_url = "http://<bulb-ip>/api"  # Replace with actual IP and API endpoint
-            try:
-                response = requests.post(f"{bulb_api_url}/change_color", json={"color": color})
-                if response.status_code == 200:
-                    self.speak(f"Changed the bulb color to {color}.")
-                else:
-                    self.speak("Failed to change the bulb color.")
-            except Exception as e:
-                self.speak("There was an error connecting to the bulb.")
-
-    def suggest_vocabulary(self):
-        """Suggest vocabulary words with definitions using spaCy.""" 
-        words = ["articulate", "eloquent", "lucid", "verbose", "succinct"]
-        word = random.choice(words)
-        self.speak(f"Today's vocabulary word is '{word}'. It means something clear or expressive.")
-
-# Run the application
-if __name__ == "__main__":
-    root = tk.Tk()
-    jarvis = AIJarvis(root)
-    root.mainloop()
+import tkinter as tk
+from tkinter import messagebox, colorchooser
+import speech_recognition as sr
+import pyttsx3
+import requests
+import random
+import threading
+
+from inference import model_version, run_parallel
+from memo import DEFAULT_CACHE_PATH, ReplyCache
+from models import ModelRegistry, load_pipeline, load_pronouncing_dict
+from intents import IntentMatcher
+from tasks import TaskLanes
+
+# Trigger phrases of each command, matched as whole words in any case
+COMMANDS = IntentMatcher({
+    "teach_english": ["teach me english"],
+    "pronounce": ["pronounce", "how do you pronounce"],
+    "correct_sentence": ["correct my sentence"],
+    "bulb_on": ["turn bulb on", "turn the bulb on", "turn on the bulb"],
+    "bulb_off": ["turn bulb off", "turn the bulb off", "turn off the bulb"],
+    "change_color": ["change color", "change the color", "change color to", "change the color to"],
+    "suggest_vocabulary": ["suggest a vocabulary word"],
+})
+
+class AIJarvis:
+    def __init__(self, root, backend="int8", threads=None, grammar="t5", cache_path=DEFAULT_CACHE_PATH):
+        self.root = root
+        self.root.title("AI Jarvis")
+        self.root.geometry("600x400")
+
+        # Initialize recognizer; the TTS engine is created by the thread that speaks
+        self.recognizer = sr.Recognizer()
+        self.tts_engine = None
+        self.tasks = TaskLanes(root)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Models load on first use, or in the background once the window is up
+        self.models = ModelRegistry()
+        self.backend = backend
+        self.threads = threads
+        self.grammar = grammar
+        self.cache = ReplyCache(cache_path)  # Corrections of sentences seen before, also across restarts
+        self.models.register("cmudict", load_pronouncing_dict)
+        self.add_model("grammar_t5", "text2text-generation", "vennify/t5-base-grammar-correction")
+        self.add_model("grammar_bart", "text2text-generation", "facebook/bart-large-mnli")
+        warm = {"both": ["grammar_t5", "grammar_bart"], "t5": ["grammar_t5"], "bart": ["grammar_bart"]}[grammar]
+
+        # Create GUI components
+        self.create_widgets()
+        self.root.after(100, self.models.warm_up, ["cmudict"] + warm)
+        self.root.after(200, self.show_model_status)
+
+    @property
+    def pronouncing_dict(self):
+        return self.models.get("cmudict")
+
+    @property
+    def grammar_checker_t5(self):
+        return self.models.get("grammar_t5")
+
+    @property
+    def grammar_checker_bart(self):
+        return self.models.get("grammar_bart")
+
+    def add_model(self, name, task, model=None):
+        """Register a pipeline; cache lookups match its version from the start, before it loads."""
+        self.cache.use_version(name, model_version(task, model, self.backend))
+        self.models.register(name, lambda: self.load_model(name, task, model))
+
+    def load_model(self, name, task, model=None):
+        """Load a pipeline, dropping cached outputs of any other version of it (e.g. after a download)."""
+        pipe = load_pipeline(task, model=model, backend=self.backend, threads=self.threads)
+        self.cache.use_version(name, model_version(task, model, pipe.backend))
+        return pipe
+
+    def create_widgets(self):
+        """Create GUI components."""
+        self.output_area = tk.Text(self.root, height=10, width=70)
+        self.output_area.pack(pady=10)
+
+        self.input_entry = tk.Entry(self.root, width=50)
+        self.input_entry.pack(pady=10)
+
+        self.send_button = tk.Button(self.root, text="Send", command=self.process_command_from_entry)
+        self.send_button.pack(pady=10)
+
+        self.listen_button = tk.Button(self.root, text="Listen", command=self.listen)
+        self.listen_button.pack(pady=10)
+
+        self.color_button = tk.Button(self.root, text="Change Bulb Color", command=self.change_color)
+        self.color_button.pack(pady=10)
+
+        self.bulb_on_button = tk.Button(self.root, text="Turn Bulb ON", command=lambda: self.control_wipro_bulb("on"))
+        self.bulb_on_button.pack(pady=10)
+
+        self.bulb_off_button = tk.Button(self.root, text="Turn Bulb OFF", command=lambda: self.control_wipro_bulb("off"))
+        self.bulb_off_button.pack(pady=10)
+
+        self.status_label = tk.Label(self.root, text="Loading models...", anchor="w")
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+
+    def show_model_status(self):
+        """Show model loading progress reported by the registry."""
+        for name, state, seconds in self.models.events():
+            if state == "loading":
+                self.status_label.config(text=f"Loading {name}...")
+            elif state == "failed":
+                self.status_label.config(text=f"Could not load {name}")
+            elif not self.models.pending():
+                self.status_label.config(text="Ready")
+            else:
+                self.status_label.config(text=f"Loaded {name} in {seconds:.1f}s")
+        self.root.after(200, self.show_model_status)
+
+    def close(self):
+        """Stop the background lanes and close the window."""
+        self.tasks.close()
+        self.cache.close()
+        self.root.destroy()
+
+    def speak(self, text):
+        """Show text and queue it for speech output; returns the speech task."""
+        self.output_area.insert(tk.END, f"Jarvis: {text}\n")
+        self.output_area.see(tk.END)
+        return self.tasks.submit("tts", self.say, text)
+
+    def say(self, text):
+        """Convert text to speech output (runs on the TTS lane, which owns the engine)."""
+        if self.tts_engine is None:
+            self.tts_engine = pyttsx3.init()
+        self.tts_engine.say(text)
+        self.tts_engine.runAndWait()
+
+    def listen(self, after=None, then=None):
+        """Listen to the user in the background, once the task `after` (e.g. a prompt being spoken) is done.
+
+        What was said goes to `then`, or is processed as a command.
+        """
+        self.output_area.insert(tk.END, "Listening...\n")
+        self.output_area.see(tk.END)
+        self.tasks.submit("asr", self.recognize, after, on_done=lambda text: self.heard(text, then),
+                          on_error=self.not_heard)
+
+    def recognize(self, after=None):
+        """Record one phrase and return its text (runs on the ASR lane)."""
+        if after is not None:
+            after.result()  # Don't record our own voice
+        with sr.Microphone() as source:
+            audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=15)
+        return self.recognizer.recognize_google(audio)
+
+    def heard(self, text, then=None):
+        """Process recognized speech."""
+        self.output_area.insert(tk.END, f"You: {text}\n")
+        self.output_area.see(tk.END)
+        (then or self.process_command)(text)
+
+    def not_heard(self, error):
+        """Report a failed recognition."""
+        if isinstance(error, (sr.UnknownValueError, sr.WaitTimeoutError)):
+            self.speak("Sorry, I didn't catch that.")
+        elif isinstance(error, sr.RequestError):
+            self.speak("Service is down.")
+        else:
+            print(f"Error listening: {error}")
+            self.speak("I couldn't use the microphone.")
+
+    def process_command_from_entry(self):
+        """Process command from input entry."""
+        command = self.input_entry.get()
+        self.output_area.insert(tk.END, f"You: {command}\n")
+        self.input_entry.delete(0, tk.END)
+        self.process_command(command)
+
+    def process_command(self, command):
+        """Identify and execute commands based on user input."""
+        intent = COMMANDS.match(command)
+        if intent is None:
+            self.speak("I didn't understand that command.")
+            return
+        handlers = {
+            "teach_english": lambda: self.teach_english(),
+            "pronounce": lambda: self.pronunciation_help(intent.rest),
+            "correct_sentence": lambda: self.listen(after=self.speak("Please say the sentence you want me to correct."),
+                                                    then=self.correct_sentence),
+            "bulb_on": lambda: self.control_wipro_bulb("on"),
+            "bulb_off": lambda: self.control_wipro_bulb("off"),
+            "change_color": lambda: self.change_color(intent.slot("color")),
+            "suggest_vocabulary": lambda: self.suggest_vocabulary(),
+        }
+        handlers[intent.name]()
+
+    def correct_english(self, sentence):
+        """Analyze and correct the grammar of a given sentence using a deep learning model.
+
+        Returns the (T5, BART) corrections. With grammar "both" the two models run
+        in parallel; otherwise only the chosen one runs and the other entry is None.
+        """
+        def t5():
+            return self.cache.memoize("grammar_t5", sentence,
+                                      lambda: self.grammar_checker_t5("grammar: " + sentence)[0]['generated_text'])
+
+        def bart():
+            return self.cache.memoize("grammar_bart", sentence,
+                                      lambda: self.grammar_checker_bart(sentence)[0]['generated_text'])
+
+        if self.grammar == "both":
+            corrected_sentence_t5, corrected_sentence_bart = run_parallel(t5, bart, threads=self.threads)
+            return corrected_sentence_t5, corrected_sentence_bart
+        if self.grammar == "bart":
+            return None, bart()
+        return t5(), None
+
+    def correct_sentence(self, sentence):
+        """Speak the corrected form of a sentence."""
+        def answer(corrections):
+            corrected = next(c for c in corrections if c is not None)
+            if corrected.strip().lower() == sentence.strip().lower():
+                self.speak("That sentence looks correct.")
+            else:
+                self.speak(f"You could say: {corrected}")
+
+        self.tasks.submit("inference", self.correct_english, sentence, on_done=answer)
+
+    def teach_english(self):
+        """A method to engage in English conversation practice."""
+        self.listen(after=self.speak("Let's practice English! Say something, and I'll help you improve."))
+
+    def pronunciation_help(self, word):
+        """Provide pronunciation help using CMU Pronouncing Dictionary."""
+        def answer(pronunciation):
+            if pronunciation:
+                phonetic = ' '.join(pronunciation[0])
+                self.speak(f"The pronunciation of '{word}' is: {phonetic}")
+            else:
+                self.speak(f"Sorry, I couldn't find the pronunciation for '{word}'.")
+
+        # The dictionary may still be loading
+        self.tasks.submit("inference", lambda: self.pronouncing_dict.get(word.lower()), on_done=answer)
+
+    def control_wipro_bulb(self, state):
+        """Turn the Wipro bulb on or off."""
+        bulb_api_url = "http://<bulb-ip>/api"  # Replace with actual IP and API endpoint
+        state = state.lower()
+        if state not in ("on", "off"):
+            return
+
+        def done(response):
+            self.speak(f"Turning the bulb {state}.")
+            if response.status_code != 200:
+                self.speak("Failed to control the bulb. Check your network and try again.")
+
+        self.tasks.submit("device", lambda: requests.post(f"{bulb_api_url}/turn_{state}", timeout=10),
+                          on_done=done, on_error=lambda e: self.speak("There was an error connecting to the bulb."))
+
+    def change_color(self, color=None):
+        """Change the color of the smart bulb, asking for one if none was named."""
+        color = color or colorchooser.askcolor()[1]  # Show color picker
+        if color:
+            bulb_api_url = "http://<bulb-ip>/api"  # Replace with actual IP and API endpoint
+
+            def done(response):
+                if response.status_code == 200:
+                    self.speak(f"Changed the bulb color to {color}.")
+                else:
+                    self.speak("Failed to change the bulb color.")
+
+            self.tasks.submit("device",
+                              lambda: requests.post(f"{bulb_api_url}/change_color", json={"color": color}, timeout=10),
+                              on_done=done, on_error=lambda e: self.speak("There was an error connecting to the bulb."))
+
+    def suggest_vocabulary(self):
+        """Suggest vocabulary words with definitions using spaCy.""" 
+        words = ["articulate", "eloquent", "lucid", "verbose", "succinct"]
+        word = random.choice(words)
+        self.speak(f"Today's vocabulary word is '{word}'. It means something clear or expressive.")
+
+# Run the application
+if __name__ == "__main__":
+    import argparse
+    from inference import BACKENDS, GRAMMAR_MODES
+
+    parser = argparse.ArgumentParser(description='AI Jarvis voice assistant')
+    parser.add_argument('--backend', type=str, default='int8', choices=BACKENDS,
+                        help='CPU inference backend (onnx needs optimum[onnxruntime])')
+    parser.add_argument('--threads', type=int, default=None, help='Torch threads per operation (default: physical cores)')
+    parser.add_argument('--grammar', type=str, default='t5', choices=GRAMMAR_MODES,
+                        help='Grammar model(s) used to correct a sentence')
+    parser.add_argument('--cache_path', type=str, default=DEFAULT_CACHE_PATH,
+                        help='SQLite file caching model outputs across restarts')
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    jarvis = AIJarvis(root, backend=args.backend, threads=args.threads, grammar=args.grammar,
+                      cache_path=args.cache_path)
+    root.mainloop()
@@ -0,0 +1,141 @@
+# memo.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'jarvis', 'replies.sqlite')
+_MISSING = object()
+
+
+def normalize_text(text: str) -> str:
+    """Cache key for an input: case and runs of whitespace don't matter."""
+    return ' '.join(text.casefold().split())
+
+
+class ReplyCache:
+    """Memoized model outputs: an in-memory LRU in front of an SQLite table that survives restarts.
+
+    Entries are keyed by (model id, model version, normalized input) and stored
+    as JSON, so outputs of other weights are never served; use_version() sets a
+    model's version (before it is loaded, too) and drops its rows from other
+    versions. The table is trimmed to max_disk_mb, least recently used first.
+    The memory tier has its own lock, so a lookup on the GUI thread never waits
+    for a background write to disk.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 1024, max_disk_mb: float = 64):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.max_entries = max_entries
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._memory_lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS replies (
+                    model TEXT NOT NULL, version TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,
+                    used REAL NOT NULL, PRIMARY KEY (model, version, key))
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS replies_used ON replies (used)")
+        self._recount()
+
+    def use_version(self, model: str, version: str):
+        """Sets the version of a model's weights that lookups must match, dropping outputs of any other."""
+        with self._memory_lock:
+            if self._versions.get(model) == version:
+                return
+            self._versions[model] = version
+            for key in [key for key in self._memory if key[0] == model and key[1] != version]:
+                del self._memory[key]
+        with self._disk_lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM replies WHERE model = ? AND version != ?", (model, version))
+            self._recount()
+
+    def _key(self, model: str, text: str) -> Tuple[str, str, str]:
+        return model, self._versions.get(model, ''), normalize_text(text)
+
+    def _remember(self, key: Tuple[str, str, str], value: Any):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, model: str, text: str, disk: bool = True) -> Any:
+        """The cached output for text, or None; disk=False only looks in memory (safe on the GUI thread)."""
+        with self._memory_lock:
+            key = self._key(model, text)
+            value = self._memory.get(key, _MISSING)
+            if value is not _MISSING:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+        if not disk:
+            return None
+        with self._disk_lock:
+            row = self.conn.execute("SELECT value FROM replies WHERE model = ? AND version = ? AND key = ?",
+                                    key).fetchone()
+            if row is not None:
+                with self.conn:
+                    self.conn.execute("UPDATE replies SET used = ? WHERE model = ? AND version = ? AND key = ?",
+                                      (time.time(),) + key)
+        with self._memory_lock:
+            if row is None:
+                self.misses += 1
+                return None
+            value = json.loads(row[0])
+            self._remember(key, value)
+            self.hits += 1
+            return value
+
+    def put(self, model: str, text: str, value: Any):
+        data = json.dumps(value)
+        with self._memory_lock:
+            key = self._key(model, text)
+            self._remember(key, value)
+        with self._disk_lock:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO replies VALUES (?, ?, ?, ?, ?)", key + (data, time.time()))
+            self.disk_bytes += len(key[2]) + len(data)  # Overcounts a replaced row until the next eviction
+            if self.disk_bytes > self.max_disk_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drops the least recently used rows that take the table over 90% of its budget, in one DELETE."""
+        target = self.max_disk_bytes * 0.9
+        # Walking the rows oldest first, a row goes while the rows from it onwards still exceed the target
+        count, freed, total = self.conn.execute("""
+            SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(MAX(total), 0) FROM (
+                SELECT size, SUM(size) OVER (ORDER BY used, rowid) AS upto, SUM(size) OVER () AS total
+                FROM (SELECT rowid, used, LENGTH(key) + LENGTH(value) AS size FROM replies))
+            WHERE total - (upto - size) > ?
+        """, (target,)).fetchone()
+        if count:
+            with self.conn:
+                self.conn.execute("DELETE FROM replies WHERE rowid IN "
+                                  "(SELECT rowid FROM replies ORDER BY used, rowid LIMIT ?)", (count,))
+        self.disk_bytes = total - freed
+
+    def _recount(self):
+        self.disk_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(key) + LENGTH(value)), 0) FROM replies").fetchone()[0]
+
+    def memoize(self, model: str, text: str, compute: Callable[[], Any]) -> Any:
+        """The cached output for text, computing and storing it on a miss."""
+        value = self.get(model, text)
+        if value is None:
+            value = compute()
+            self.put(model, text, value)
+        return value
+
+    def close(self):
+        with self._disk_lock:
+            self.conn.close()
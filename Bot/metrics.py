@@ -0,0 +1,130 @@
+# metrics.py
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+# Upper bounds in seconds of the latency histogram buckets
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class Metrics:
+    """Counters and stage-latency histograms for a crawl, exportable as Prometheus text or JSON."""
+
+    def __init__(self, prefix: str = 'webscraper'):
+        self.prefix = prefix
+        self.started = time.monotonic()
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Times the enclosed block into the stage's histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def total(self, name: str) -> float:
+        with self._lock:
+            return sum(self.counters.get(name, {}).values())
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                metric = f"{self.prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in sorted(series.items()):
+                    labels = ','.join(f'{k}="{v}"' for k, v in key)
+                    lines.append(f"{metric}{{{labels}}} {value:g}" if labels else f"{metric} {value:g}")
+
+            metric = f"{self.prefix}_stage_seconds"
+            if self.histograms:
+                lines.append(f"# TYPE {metric} histogram")
+            for stage, histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            counters = {name: {','.join(f'{k}={v}' for k, v in key) or 'total': value
+                               for key, value in series.items()}
+                        for name, series in self.counters.items()}
+            stages = {stage: {'count': h.count, 'sum': round(h.sum, 6),
+                              'mean': round(h.sum / h.count, 6) if h.count else 0.0,
+                              'p50': h.quantile(0.5), 'p99': h.quantile(0.99)}
+                      for stage, h in self.histograms.items()}
+        return {'uptime_seconds': round(time.monotonic() - self.started, 3), 'counters': counters,
+                'stages': stages}
+
+    def dump(self, path: str):
+        """Writes the metrics to path, as JSON for *.json and Prometheus text otherwise."""
+        with open(path, 'w') as f:
+            if path.endswith('.json'):
+                json.dump(self.to_dict(), f, indent=4)
+            else:
+                f.write(self.to_prometheus())
+
+
+def timed(stage: str):
+    """Decorator timing a method into self.metrics under stage."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.timer(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
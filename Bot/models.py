@@ -0,0 +1,112 @@
+# models.py
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# nltk data packages and the path nltk.data.find() locates them by
+NLTK_RESOURCES = {
+    'cmudict': 'corpora/cmudict',
+    'wordnet': 'corpora/wordnet',
+    'punkt': 'tokenizers/punkt',
+}
+
+
+def ensure_nltk(package: str) -> bool:
+    """Downloads an nltk data package unless it is already installed; returns True if it had to download."""
+    import nltk
+
+    try:
+        nltk.data.find(NLTK_RESOURCES.get(package, package))  # Also looks inside package.zip
+        return False
+    except LookupError:
+        nltk.download(package, quiet=True)
+        return True
+
+
+def load_pronouncing_dict():
+    ensure_nltk('cmudict')
+    from nltk.corpus import cmudict
+    return cmudict.dict()
+
+
+def load_pipeline(task: str, model: Optional[str] = None, backend: str = 'int8', threads: Optional[int] = None):
+    from inference import build_pipeline  # Imports torch; kept off the startup path
+    return build_pipeline(task, model=model, backend=backend, threads=threads)
+
+
+class ModelRegistry:
+    """Named model loaders that each run once: on first use, or ahead of time in a warm-up thread.
+
+    Loading never happens at construction, so the GUI can come up at once.
+    Progress events (name, state, seconds) are put on `progress`, where
+    state is 'loading', 'ready' or 'failed'; a GUI polls it from its own thread.
+    """
+
+    def __init__(self):
+        self.progress: queue.Queue = queue.Queue()
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._order: List[str] = []
+        self._models: Dict[str, Any] = {}
+        self._errors: Dict[str, BaseException] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Adds a model; warm_up() loads models in registration order."""
+        self._loaders[name] = loader
+        self._order.append(name)
+        self._locks[name] = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._loaders
+
+    def ready(self, name: str) -> bool:
+        return name in self._models
+
+    def pending(self) -> List[str]:
+        """Registered models that are neither loaded nor failed."""
+        return [name for name in self._order if name not in self._models and name not in self._errors]
+
+    def get(self, name: str) -> Any:
+        """The loaded model, loading it now (or waiting for the warm-up thread to finish it) if needed."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._locks[name]:  # Only one thread runs a given loader
+            if name in self._models:
+                return self._models[name]
+            if name in self._errors:
+                raise self._errors[name]
+            self.progress.put((name, 'loading', 0.0))
+            start = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._errors[name] = e
+                self.progress.put((name, 'failed', time.perf_counter() - start))
+                raise
+            self._models[name] = model
+            self.progress.put((name, 'ready', time.perf_counter() - start))
+            return model
+
+    def warm_up(self, names: Optional[List[str]] = None) -> threading.Thread:
+        """Loads the given models (default: all) one after another in a daemon thread."""
+        def run():
+            for name in names or self._order:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    print(f"Error loading {name}: {e}")
+
+        thread = threading.Thread(target=run, name='model-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def events(self) -> List[Tuple[str, str, float]]:
+        """Progress events since the last call, without blocking."""
+        events = []
+        try:
+            while True:
+                events.append(self.progress.get_nowait())
+        except queue.Empty:
+            return events
@@ -0,0 +1,271 @@
+# politeness.py
+import heapq
+import itertools
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+def host_of(url: str) -> str:
+    """Returns the host (netloc) a URL belongs to, lowercased."""
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket that hands out one token every `interval` seconds, up to `burst` saved tokens."""
+
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = interval
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        if self.interval <= 0:
+            self.tokens = float(self.burst)
+        else:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) / self.interval)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) * self.interval
+
+    def take(self, now: float):
+        """Consumes one token."""
+        self._refill(now)
+        self.tokens -= 1
+
+
+class HostState:
+    """Queue and politeness bookkeeping for a single host."""
+
+    def __init__(self, interval: float, burst: int):
+        self.queue: List[Tuple[float, int, str, int]] = []  # Heap of (priority, seq, url, depth)
+        self.queued: Dict[str, Tuple[float, int]] = {}  # (priority, depth) of waiting URLs; other entries are stale
+        self.base_interval = interval
+        self.interval = interval
+        self.bucket = TokenBucket(interval, burst)
+        self.blocked_until = 0.0  # Set from Retry-After on 429/503
+        self.in_flight = 0
+        self.scheduled = False  # Whether the host has an entry in the ready heap
+        self.robots_checked = False
+
+    def delay(self, now: float) -> float:
+        return max(self.bucket.delay(now), self.blocked_until - now)
+
+    def best(self) -> Optional[float]:
+        """Priority of the host's next URL, dropping superseded heap entries on the way."""
+        while self.queue:
+            priority, _, url, _ = self.queue[0]
+            if url in self.queued and self.queued[url][0] == priority:
+                return priority
+            heapq.heappop(self.queue)
+        return None
+
+    def pop(self) -> Tuple[str, int]:
+        self.best()
+        _, _, url, depth = heapq.heappop(self.queue)
+        del self.queued[url]
+        return url, depth
+
+
+class HostScheduler:
+    """Per-host crawl frontier that only releases a URL once its host's token bucket allows it.
+
+    Each host has its own queue and bucket, so a slow or rate-limited host never
+    holds back pages on other hosts. Queues are ordered by priority (lowest
+    first; the depth unless the caller scores URLs), and among the hosts that may
+    be fetched now the one with the best next URL goes first. The interval between requests to a host starts
+    at `delay` (or the robots.txt Crawl-delay if larger), doubles on 429/503 (up
+    to `max_delay`), grows on slow responses and decays back to the base on
+    healthy ones. A Retry-After blocks the host for as long as it asks.
+    """
+
+    def __init__(self, delay: float = 1.0, burst: int = 1, max_per_host: int = 1,
+                 slow_threshold: float = 5.0, max_delay: float = 60.0):
+        self.delay = delay
+        self.burst = burst
+        self.max_per_host = max(1, max_per_host)
+        self.slow_threshold = slow_threshold
+        self.max_delay = max_delay
+        self._hosts: Dict[str, HostState] = {}
+        self._ready = []  # Heap of (time the host may be fetched again, host)
+        self._eligible = []  # Heap of (priority of its next URL, seq, host) for hosts whose time has come
+        self._seq = itertools.count()
+        self._queued = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._queued
+
+    def _state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(self.delay, self.burst)
+        return state
+
+    def _schedule(self, host: str, state: HostState, now: float):
+        if state.scheduled or not state.queued or state.in_flight >= self.max_per_host:
+            return
+        state.scheduled = True
+        heapq.heappush(self._ready, (now + state.delay(now), host))
+
+    def add(self, url: str, depth: int, priority: Optional[float] = None):
+        """Queues a URL among the other pages of its host, by priority (default: its depth)."""
+        host = host_of(url)
+        priority = float(depth) if priority is None else priority
+        with self._lock:
+            state = self._state(host)
+            if url in state.queued:
+                if priority >= state.queued[url][0]:
+                    return
+                depth = state.queued[url][1]
+            else:
+                self._queued += 1
+            state.queued[url] = (priority, depth)
+            heapq.heappush(state.queue, (priority, next(self._seq), url, depth))
+            self._schedule(host, state, time.monotonic())
+
+    def reprioritize(self, url: str, priority: float) -> bool:
+        """Moves a still-queued URL up to a better (lower) priority; returns whether it moved."""
+        host = host_of(url)
+        with self._lock:
+            state = self._hosts.get(host)
+            current = state.queued.get(url) if state is not None else None
+            if current is None or priority >= current[0]:
+                return False
+            state.queued[url] = (priority, current[1])
+            heapq.heappush(state.queue, (priority, next(self._seq), url, current[1]))
+            return True
+
+    def next_ready(self) -> Tuple[Optional[Tuple[str, int]], Optional[float]]:
+        """Returns ((url, depth), 0) for a fetchable URL, or (None, seconds to wait).
+
+        The wait is None when no host can become ready until an in-flight page is released.
+        """
+        with self._lock:
+            now = time.monotonic()
+            while self._ready and self._ready[0][0] <= now:  # Hosts whose interval is up compete on priority
+                _, host = heapq.heappop(self._ready)
+                state = self._hosts[host]
+                best = state.best()
+                if best is None or state.in_flight >= self.max_per_host:
+                    state.scheduled = False
+                    continue
+                heapq.heappush(self._eligible, (best, next(self._seq), host))
+
+            while self._eligible:
+                _, _, host = heapq.heappop(self._eligible)
+                state = self._hosts[host]
+                state.scheduled = False
+                if not state.queued or state.in_flight >= self.max_per_host:
+                    continue
+                delay = state.delay(now)
+                if delay > 0:  # Backed off since it was scheduled
+                    state.scheduled = True
+                    heapq.heappush(self._ready, (now + delay, host))
+                    continue
+
+                state.bucket.take(now)
+                state.in_flight += 1
+                self._queued -= 1
+                item = state.pop()
+                self._schedule(host, state, now)
+                return item, 0.0
+
+            if self._ready:
+                return None, self._ready[0][0] - now
+            return None, None
+
+    def acquire(self, url: str):
+        """Blocks until a request outside the frontier (e.g. for an image) may go to the URL's host.
+
+        The request takes a token and an in-flight slot like a page dispatched by
+        next_ready(), so it obeys the same interval, backoff and max_per_host; call
+        release() when it is done.
+        """
+        host = host_of(url)
+        while True:
+            with self._lock:
+                state = self._state(host)
+                now = time.monotonic()
+                delay = state.delay(now)
+                if delay <= 0 and state.in_flight < self.max_per_host:
+                    state.bucket.take(now)
+                    state.in_flight += 1
+                    return
+            time.sleep(min(delay, self.max_delay) if delay > 0 else 0.05)  # Else wait for a slot to free up
+
+    def release(self, url: str):
+        """Marks a page dispatched by next_ready() (or a request from acquire()) as finished."""
+        host = host_of(url)
+        with self._lock:
+            state = self._state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+            self._schedule(host, state, time.monotonic())
+
+    def claim_robots(self, url: str) -> bool:
+        """Returns True exactly once per host, for the caller that should look up its Crawl-delay."""
+        with self._lock:
+            state = self._state(host_of(url))
+            if state.robots_checked:
+                return False
+            state.robots_checked = True
+            return True
+
+    def set_crawl_delay(self, url: str, crawl_delay: Optional[float]):
+        """Raises the host's base interval to its robots.txt Crawl-delay."""
+        if crawl_delay is None:
+            return
+        with self._lock:
+            state = self._state(host_of(url))
+            state.base_interval = max(self.delay, float(crawl_delay))
+            state.interval = max(state.interval, state.base_interval)
+            state.bucket.interval = state.interval
+
+    def record(self, url: str, status: Optional[int], elapsed: float, retry_after: Optional[float] = None):
+        """Adapts the host's interval to the outcome of a request."""
+        with self._lock:
+            state = self._state(host_of(url))
+            now = time.monotonic()
+            if status in (429, 503):
+                state.interval = min(self.max_delay, max(state.interval * 2, state.base_interval, 1.0))
+                # max_delay caps the adaptive interval only: the host's own Retry-After is honoured in full
+                pause = retry_after if retry_after is not None else state.interval
+                state.blocked_until = max(state.blocked_until, now + pause)
+            elif status is None or elapsed > self.slow_threshold:
+                state.interval = min(self.max_delay, max(state.interval * 1.5, state.base_interval, 0.5))
+            else:
+                state.interval = max(state.base_interval, state.interval * 0.9)
+            state.bucket.interval = state.interval
+
+    def wait_turn(self, url: str) -> bool:
+        """Blocks until the host's backoff has elapsed; used before retrying a rate-limited request.
+
+        Returns False at once when the host asked for a longer pause than
+        max_delay: the caller should queue the URL again rather than hold a fetcher.
+        """
+        with self._lock:
+            state = self._state(host_of(url))
+            delay = max(state.interval, state.blocked_until - time.monotonic())
+        if delay > self.max_delay:
+            return False
+        time.sleep(delay)
+        return True
@@ -0,0 +1,118 @@
+# recrawl.py
+import json
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class PageRecord:
+    """What the last crawls learned about one URL."""
+
+    def __init__(self, url: str, etag: Optional[str], last_modified: Optional[str], content_hash: Optional[str],
+                 first_checked: float, last_checked: float, checks: int, changes: int, next_due: float,
+                 links: str):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+        self.first_checked = first_checked
+        self.last_checked = last_checked
+        self.checks = checks
+        self.changes = changes
+        self.next_due = next_due
+        self.links: List[str] = json.loads(links) if links else []
+
+
+class PageHistory:
+    """Validators, content hashes and change history per URL, kept across crawls for incremental re-crawls.
+
+    Revisits are scheduled from each page's estimated change rate: after n
+    revisits at a mean interval I that found X changes, the rate is estimated as
+    -ln((n - X + 0.5) / (n + 0.5)) / I (Cho & Garcia-Molina), and the page is due
+    again after 1 / rate, clamped to [min_interval, max_interval].
+    """
+
+    COLUMNS = ('url', 'etag', 'last_modified', 'content_hash', 'first_checked', 'last_checked', 'checks',
+               'changes', 'next_due', 'links')
+
+    def __init__(self, path: str, min_interval: float = 3600.0, max_interval: float = 30 * 86400.0,
+                 default_interval: float = 86400.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT,
+                first_checked REAL, last_checked REAL, checks INTEGER, changes INTEGER,
+                next_due REAL, links TEXT)
+        """)
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[PageRecord]:
+        with self._lock:
+            row = self.conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM pages WHERE url = ?", (url,)).fetchone()
+        return PageRecord(*row) if row else None
+
+    def due(self, record: Optional[PageRecord], now: Optional[float] = None) -> bool:
+        """Whether a page should be fetched again (always, if it was never fetched)."""
+        return record is None or record.next_due <= (now or time.time())
+
+    @staticmethod
+    def conditional_headers(record: Optional[PageRecord]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers from the page's last response."""
+        headers = {}
+        if record is not None:
+            if record.etag:
+                headers['If-None-Match'] = record.etag
+            if record.last_modified:
+                headers['If-Modified-Since'] = record.last_modified
+        return headers
+
+    def revisit_interval(self, checks: int, changes: int, span: float) -> float:
+        revisits = checks - 1  # The first fetch cannot observe a change
+        if revisits < 1 or span <= 0:
+            return self.default_interval
+        mean_interval = span / revisits
+        if changes >= revisits:  # Changed every time we looked: come back sooner
+            interval = mean_interval / 2
+        else:
+            rate = -math.log((revisits - changes + 0.5) / (revisits + 0.5)) / mean_interval
+            interval = 1 / rate if rate > 0 else self.max_interval
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def observe(self, url: str, changed: bool, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                content_hash: Optional[str] = None):
+        """Records a fetch (a 304 counts as unchanged) and schedules the next visit."""
+        now = time.time()
+        record = self.get(url)
+        if record is None:
+            first, checks, changes = now, 1, 0
+        else:
+            first, checks, changes = record.first_checked, record.checks + 1, record.changes + int(changed)
+            etag = etag or record.etag
+            last_modified = last_modified or record.last_modified
+            content_hash = content_hash or record.content_hash
+        next_due = now + self.revisit_interval(checks, changes, now - first)
+        with self._lock:
+            self.conn.execute("""
+                INSERT INTO pages (url, etag, last_modified, content_hash, first_checked, last_checked, checks,
+                                   changes, next_due, links)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, '')
+                ON CONFLICT(url) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash, last_checked = excluded.last_checked,
+                    checks = excluded.checks, changes = excluded.changes, next_due = excluded.next_due
+            """, (url, etag, last_modified, content_hash, first, now, checks, changes, next_due))
+
+    def set_links(self, url: str, links: List[str]):
+        """Remembers a page's links so they can be followed without re-extracting it."""
+        with self._lock:
+            self.conn.execute("UPDATE pages SET links = ? WHERE url = ?", (json.dumps(links), url))
+
+    def commit(self):
+        with self._lock:
+            self.conn.commit()
@@ -0,0 +1,147 @@
+# robots.py
+import gzip
+import io
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+# Fetches a URL; extra keyword arguments (stream=True) go to requests
+Getter = Callable[..., requests.Response]
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+class RobotsCache:
+    """Per-host robots.txt rules and sitemap lists, refreshed after `ttl` seconds.
+
+    Follows urllib.robotparser for status codes: 401/403 disallow the whole host,
+    other 4xx allow it. A 5xx or network error disallows the host until a retry
+    `error_ttl` seconds later, since the server may just be overloaded.
+    """
+
+    def __init__(self, get: Getter, user_agent: str = '*', ttl: float = 24 * 3600, error_ttl: float = 300):
+        self.get = get
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._entries: Dict[str, Tuple[float, RobotFileParser]] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, origin: str) -> Tuple[float, RobotFileParser]:
+        robots_url = f"{origin}/robots.txt"
+        rules = RobotFileParser(robots_url)
+        try:
+            response = self.get(robots_url)
+        except requests.RequestException:
+            rules.disallow_all = True
+            return time.monotonic() + self.error_ttl, rules
+
+        if response.status_code in (401, 403):
+            rules.disallow_all = True
+        elif 400 <= response.status_code < 500:
+            rules.allow_all = True
+        elif response.status_code >= 500:
+            rules.disallow_all = True
+            return time.monotonic() + self.error_ttl, rules
+        else:
+            rules.parse(response.text.splitlines())
+        return time.monotonic() + self.ttl, rules
+
+    def rules(self, url: str, fetch: bool = True) -> Optional[RobotFileParser]:
+        """Parsed robots.txt for the URL's host, fetching it when missing or stale."""
+        parts = urlparse(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        entry = self._entries.get(origin)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        if not fetch:
+            return entry[1] if entry else None
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(origin, threading.Lock())
+        with host_lock:  # Only one thread fetches a given host's robots.txt
+            entry = self._entries.get(origin)
+            if not entry or entry[0] <= time.monotonic():
+                entry = self._entries[origin] = self._fetch(origin)
+        return entry[1]
+
+    def allowed(self, url: str, fetch: bool = True) -> bool:
+        """Whether robots.txt lets us fetch url. With fetch=False unknown hosts count as allowed."""
+        rules = self.rules(url, fetch)
+        return rules is None or rules.can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        rules = self.rules(url)
+        delay = rules.crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+    def sitemaps(self, url: str) -> List[str]:
+        """Sitemaps listed in robots.txt, or the conventional /sitemap.xml when none are."""
+        listed = self.rules(url).site_maps()
+        if listed:
+            return listed
+        parts = urlparse(url)
+        return [f"{parts.scheme}://{parts.netloc}/sitemap.xml"]
+
+    def iter_sitemap(self, sitemap_url: str, max_nesting: int = 3) -> Iterator[Tuple[str, Optional[str]]]:
+        """Streams (loc, lastmod) pairs from a sitemap, following sitemap indexes.
+
+        The XML is parsed incrementally from the response stream (gunzipping
+        .xml.gz files), and entries are dropped from the tree once read, so sitemaps of
+        any size are processed in constant memory.
+        """
+        try:
+            response = self.get(sitemap_url, stream=True)
+        except requests.RequestException as e:
+            print(f"Error fetching sitemap {sitemap_url}: {e}")
+            return
+        if response.status_code != 200:
+            response.close()
+            return
+
+        response.raw.decode_content = True  # Undo Content-Encoding: gzip
+        response.raw.auto_close = False  # Let the buffered readers see EOF instead of a closed file
+        stream = io.BufferedReader(response.raw)
+        if stream.peek(2)[:2] == b'\x1f\x8b':  # A gzipped sitemap file (.xml.gz)
+            stream = gzip.GzipFile(fileobj=stream)
+
+        children = []
+        try:
+            root = None
+            loc = lastmod = None
+            for event, element in ET.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = element
+                    continue
+                tag = _local(element.tag)
+                if tag == 'loc':
+                    loc = (element.text or '').strip()
+                elif tag == 'lastmod':
+                    lastmod = (element.text or '').strip() or None
+                elif tag == 'url':
+                    if loc:
+                        yield loc, lastmod
+                    loc = lastmod = None
+                    root.clear()  # Drop the entries read so far
+                elif tag == 'sitemap':
+                    if loc:
+                        children.append(loc)
+                    loc = lastmod = None
+                    root.clear()
+        except (ET.ParseError, OSError, EOFError) as e:
+            print(f"Error parsing sitemap {sitemap_url}: {e}")
+        finally:
+            response.close()
+
+        if max_nesting > 0:
+            for child in children:
+                yield from self.iter_sitemap(child, max_nesting - 1)
@@ -0,0 +1,204 @@
+# schema.py
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+import soupsieve
+
+FIELD_TYPES = ('str', 'int', 'float', 'bool', 'url')
+INT = re.compile(r'[-+]?\d[\d,]*')
+FLOAT = re.compile(r'[-+]?(?:\d[\d,]*(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?')
+TAG_NAME = re.compile(r'^[a-zA-Z][\w-]*')
+COMBINATORS = re.compile(r'[\s>+~]+')
+
+
+def subject_tag(css: str) -> Optional[str]:
+    """Tag name every element matching css must have, or None when that cannot be told cheaply."""
+    if any(char in css for char in ',()"\''):  # Selector lists, functional pseudo-classes, quoted values
+        return None
+    match = TAG_NAME.match(COMBINATORS.split(css.strip())[-1])
+    return match.group(0).lower() if match else None
+
+
+class Field:
+    """One schema field: elements matching `selector`, their text or `attr`, coerced to `type`."""
+
+    def __init__(self, name: str, selector: str, attr: Optional[str] = None, type: str = 'str', many: bool = False,
+                 default: Any = None):
+        if type not in FIELD_TYPES:
+            raise ValueError(f"Field '{name}' has unknown type '{type}'. Choose one of: {', '.join(FIELD_TYPES)}")
+        self.name = name
+        self.selector = selector
+        self.attr = attr
+        self.type = type
+        self.many = many  # Every match in document order instead of the first one
+        self.default = default if default is not None else ([] if many else (False if type == 'bool' else None))
+        self.tag = subject_tag(selector)
+        soupsieve.compile(selector)  # Fail on a bad selector now rather than on the first page
+
+    def convert(self, raw: str, base: Optional[str]) -> Any:
+        """Coerces an extracted string, or returns None when it does not parse as the field's type."""
+        if self.type == 'str':
+            return raw
+        if self.type == 'bool':
+            return True
+        if self.type == 'url':
+            return urljoin(base or '', raw) if raw else None
+        match = (INT if self.type == 'int' else FLOAT).search(raw)
+        if not match:
+            return None
+        number = match.group(0).replace(',', '')
+        try:
+            return int(number) if self.type == 'int' else float(number)
+        except ValueError:
+            return None
+
+    def to_dict(self) -> Dict:
+        return {'selector': self.selector, 'attr': self.attr, 'type': self.type, 'many': self.many,
+                'default': self.default}
+
+
+class ExtractionSchema:
+    """Field names mapped to selectors, applied to every page during the extractor's single DOM walk.
+
+    A schema file is a JSON object of fields; a string value is shorthand for the
+    text of the first match, an object may set "selector", "attr", "type" (one of
+    FIELD_TYPES), "many" and "default":
+
+        {"title": "h1",
+         "price": {"selector": ".price", "type": "float"},
+         "photo": {"selector": "img.main", "attr": "src", "type": "url"},
+         "tags": {"selector": ".tag", "many": true}}
+    """
+
+    def __init__(self, fields: Optional[List[Field]] = None):
+        self.fields = list(fields or [])
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> 'ExtractionSchema':
+        fields = []
+        for name, value in spec.items():
+            if isinstance(value, str):
+                fields.append(Field(name, value))
+            else:
+                fields.append(Field(name, **value))
+        return cls(fields)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ExtractionSchema':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_selectors(cls, selectors: Optional[Dict[str, str]]) -> 'ExtractionSchema':
+        """Schema of NAME=CSS selectors, each taking the text of its first match."""
+        return cls([Field(name, css, default='') for name, css in (selectors or {}).items()])
+
+    def merge(self, other: Optional['ExtractionSchema']) -> 'ExtractionSchema':
+        """Fields of both schemas; other's win on a name clash."""
+        if other is None:
+            return self
+        names = {field.name for field in other.fields}
+        return ExtractionSchema([field for field in self.fields if field.name not in names] + other.fields)
+
+    def to_dict(self) -> Dict[str, Dict]:
+        return {field.name: field.to_dict() for field in self.fields}
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def compile(self, backend: str) -> 'CompiledSchema':
+        return CompiledSchema(self, backend)
+
+
+Matcher = Tuple[int, Field, Optional[Callable[[Any], bool]]]
+
+
+class CompiledSchema:
+    """A schema's selectors compiled once for one parser backend, indexed by the tag they can match.
+
+    Each element of the walk is only tested against the fields whose selector
+    ends in its tag name (plus those that could match any tag), so adding fields
+    does not multiply the work done per element.
+    """
+
+    def __init__(self, schema: ExtractionSchema, backend: str):
+        self.fields = schema.fields
+        self.backend = backend
+        self.has_many = any(field.many for field in self.fields)  # Such fields keep matching to the end
+        self.by_tag: Dict[str, List[Matcher]] = {}
+        self.any_tag: List[Matcher] = []
+        for index, field in enumerate(self.fields):
+            # selectolax matches by node against RowBuilder.selected: css_matches() is also true of a match's ancestors
+            match = None if backend == 'selectolax' else soupsieve.compile(field.selector).match
+            matcher = (index, field, match)
+            if field.tag is None:
+                self.any_tag.append(matcher)
+            else:
+                self.by_tag.setdefault(field.tag, []).append(matcher)
+
+    def row(self, tree=None) -> 'RowBuilder':
+        """A builder for one page; the selectolax backend needs the page's parsed tree."""
+        return RowBuilder(self, tree)
+
+    def value(self, element, field: Field) -> str:
+        """The text (or attribute) of a matched element, as a string."""
+        if self.backend == 'selectolax':
+            if field.attr is None:
+                return element.text(strip=True)
+            return element.attributes.get(field.attr) or ''
+        if field.attr is None:
+            return element.get_text(strip=True)
+        value = element.get(field.attr)
+        return ' '.join(value) if isinstance(value, list) else (value or '')  # class and rel are lists in bs4
+
+
+class RowBuilder:
+    """Collects one page's field values as the extractor walks its elements."""
+
+    def __init__(self, compiled: CompiledSchema, tree=None):
+        self.compiled = compiled
+        self.selected: Optional[List[Set[int]]] = None  # selectolax: the matching nodes of each field, by mem_id
+        if compiled.backend == 'selectolax' and tree is not None:
+            self.selected = [{node.mem_id for node in tree.css(field.selector)} for field in compiled.fields]
+        self.values: List[Optional[List[str]]] = [None] * len(compiled.fields)
+        self.done = [False] * len(compiled.fields)
+        self.remaining = sum(not field.many for field in compiled.fields)  # First-match fields still unmatched
+
+    def visit(self, tag_name: str, element):
+        if not self.remaining and not self.compiled.has_many:
+            return
+        for matchers in (self.compiled.by_tag.get(tag_name), self.compiled.any_tag):
+            if not matchers:
+                continue
+            for index, field, match in matchers:
+                if self.done[index]:
+                    continue
+                if self.selected is not None:
+                    if element.mem_id not in self.selected[index]:
+                        continue
+                elif not match(element):
+                    continue
+                value = self.compiled.value(element, field)
+                if field.many:
+                    if self.values[index] is None:
+                        self.values[index] = []
+                    self.values[index].append(value)
+                else:
+                    self.values[index] = [value]
+                    self.done[index] = True
+                    self.remaining -= 1
+
+    def finish(self, base: Optional[str]) -> Dict[str, Any]:
+        """The typed row: {field name: value}, with each field's default where nothing matched."""
+        row = {}
+        for field, raw in zip(self.compiled.fields, self.values):
+            if raw is None:
+                row[field.name] = field.default
+            elif field.many:
+                row[field.name] = [field.convert(value, base) for value in raw]
+            else:
+                converted = field.convert(raw[0], base)
+                row[field.name] = converted if converted is not None else field.default
+        return row
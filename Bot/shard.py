@@ -0,0 +1,292 @@
+# shard.py
+"""Sharded crawl: hosts are spread over N WebScraper processes by consistent hashing of their names.
+
+Each shard keeps the frontier, visited set, politeness state and output of the
+hosts it owns, and hands every link to another host's page to that host's shard.
+The shards talk through queues served by a multiprocessing manager, so shards on
+other machines can join by connecting to the coordinator's address.
+"""
+import bisect
+import hashlib
+import ipaddress
+import os
+import queue
+import secrets
+import threading
+import time
+from multiprocessing import Process
+from multiprocessing.managers import BaseManager, EventProxy
+from typing import Dict, List, Optional, Tuple
+
+from politeness import host_of
+from webscrap import WebScraper
+
+_inboxes: List[queue.Queue] = []  # State of the manager's server process, see _init_server()
+_status: Optional[queue.Queue] = None
+_stop: Optional[threading.Event] = None
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """Consistent hashing of hostnames onto shards, with `replicas` virtual nodes per shard.
+
+    The ring only depends on the shard count, so every process (on any machine)
+    agrees on which shard owns a host without asking the others.
+    """
+
+    def __init__(self, shards: int, replicas: int = 100):
+        self.shards = shards
+        points = sorted((_hash(f"shard-{shard}-{replica}"), shard)
+                        for shard in range(shards) for replica in range(replicas))
+        self._keys = [key for key, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_of(self, host: str) -> int:
+        index = bisect.bisect(self._keys, _hash(host)) % len(self._keys)
+        return self._shards[index]
+
+
+class ShardRouter:
+    """Connects one shard's crawl loop to the others: sends out the links it does not own and takes in its own.
+
+    Outgoing links are batched per shard. The shard reports (sent, received,
+    idle) to the coordinator on every change and at least every
+    `report_interval` seconds; the crawl is over once the coordinator sets stop.
+    """
+
+    def __init__(self, index: int, ring: HashRing, inboxes: List, status, stop, batch_size: int = 100,
+                 report_interval: float = 0.5):
+        self.index = index
+        self.ring = ring
+        self.inboxes = inboxes
+        self.status = status
+        self.stop = stop
+        self.batch_size = batch_size
+        self.report_interval = report_interval
+        self.sent = 0
+        self.received = 0
+        self._outgoing: Dict[int, List[Tuple[str, int]]] = {}
+        self._last_report: Optional[Tuple[int, int, bool]] = None
+        self._next_report = 0.0
+        self._finished = False
+
+    def owns(self, url: str) -> bool:
+        return self.ring.shard_of(host_of(url)) == self.index
+
+    def send(self, url: str, depth: int):
+        shard = self.ring.shard_of(host_of(url))
+        batch = self._outgoing.setdefault(shard, [])
+        batch.append((url, depth))
+        if len(batch) >= self.batch_size:
+            self._send(shard)
+
+    def _send(self, shard: int):
+        batch = self._outgoing.pop(shard, None)
+        if batch:
+            self.inboxes[shard].put(batch)
+            self.sent += len(batch)
+
+    def flush(self):
+        for shard in list(self._outgoing):
+            self._send(shard)
+
+    def receive(self, timeout: float = 0.0) -> List[Tuple[str, int]]:
+        """Links routed to this shard, waiting up to timeout for the first batch."""
+        inbox = self.inboxes[self.index]
+        links = []
+        try:
+            links.extend(inbox.get(timeout=timeout) if timeout else inbox.get_nowait())
+            while True:
+                links.extend(inbox.get_nowait())
+        except queue.Empty:
+            pass
+        self.received += len(links)
+        return links
+
+    def report(self, idle: bool):
+        """Sends buffered links when idle or due, and tells the coordinator how far this shard is."""
+        now = time.monotonic()
+        if not idle and now < self._next_report:
+            return
+        self.flush()  # An idle shard must not sit on links other shards are waiting for
+        state = (self.sent, self.received, idle)
+        if state != self._last_report or now >= self._next_report:
+            self.status.put((self.index,) + state)
+            self._last_report = state
+            self._next_report = now + self.report_interval
+            self._finished = self.stop.is_set()
+
+    def finished(self) -> bool:
+        return self._finished
+
+
+class CrawlManager(BaseManager):
+    pass
+
+
+def _inbox(index: int) -> queue.Queue:
+    return _inboxes[index]
+
+
+def _status_queue() -> queue.Queue:
+    return _status
+
+
+def _stop_event() -> threading.Event:
+    return _stop
+
+
+CrawlManager.register('inbox', callable=_inbox)
+CrawlManager.register('status', callable=_status_queue)
+CrawlManager.register('stop', callable=_stop_event, proxytype=EventProxy)
+
+
+def _init_server(shards: int):
+    global _inboxes, _status, _stop
+    _inboxes = [queue.Queue() for _ in range(shards)]
+    _status = queue.Queue()
+    _stop = threading.Event()
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:  # A hostname or wildcard
+        return False
+
+
+def parse_indices(spec: str, shards: int) -> List[int]:
+    """Shard indices from a spec like '0-3,6'; 'all' (or empty) means every shard."""
+    if not spec or spec == 'all':
+        return list(range(shards))
+    indices = []
+    for part in spec.split(','):
+        first, _, last = part.partition('-')
+        indices.extend(range(int(first), int(last or first) + 1))
+    return indices
+
+
+def run_shard(index: int, shards: int, address: Tuple[str, int], authkey: bytes, start_url: str, options: Dict):
+    """Crawls the hosts of one shard, saving to save_path/shard_NNN."""
+    manager = CrawlManager(address=address, authkey=authkey)
+    manager.connect()
+    options = dict(options)
+    resume = options.pop('resume', False)
+    save_path = os.path.join(options.pop('save_path', './scraped_data'), f"shard_{index:03d}")
+    scraper = WebScraper(start_url, save_path=save_path, **options)
+    scraper.router = ShardRouter(index, HashRing(shards), [manager.inbox(i) for i in range(shards)],
+                                 manager.status(), manager.stop())
+    scraper.crawl(start_url, resume=resume)
+
+
+def start_shards(indices: List[int], shards: int, address: Tuple[str, int], authkey: bytes, start_url: str,
+                 options: Dict) -> List[Process]:
+    processes = []
+    for index in indices:
+        process = Process(target=run_shard, args=(index, shards, address, authkey, start_url, options),
+                          name=f"shard-{index}")
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def wait_for_shards(manager: CrawlManager, shards: int, processes: List[Process], settle: float = 1.0):
+    """Sets stop once every shard is idle and every routed link has been received.
+
+    The counters must hold still for `settle` seconds, so a shard that just
+    picked up a batch has time to report itself busy again.
+    """
+    status = manager.status()
+    latest: Dict[int, Tuple[int, int, bool]] = {}
+    stable, stable_since = None, 0.0
+    while True:
+        try:
+            index, sent, received, idle = status.get(timeout=0.2)
+            latest[index] = (sent, received, idle)
+            continue  # Drain every pending report before judging
+        except queue.Empty:
+            pass
+
+        if any(p.exitcode not in (None, 0) for p in processes):
+            print("A shard failed; stopping the crawl.")
+            break
+        done = (len(latest) == shards and all(idle for _, _, idle in latest.values())
+                and sum(s for s, _, _ in latest.values()) == sum(r for _, r, _ in latest.values()))
+        if not done:
+            stable = None
+            continue
+        snapshot = tuple(sorted(latest.items()))
+        if snapshot != stable:
+            stable, stable_since = snapshot, time.monotonic()
+        elif time.monotonic() - stable_since >= settle:
+            break
+    manager.stop().set()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Sharded Web Scraper: one process per shard of hosts')
+    parser.add_argument('url', type=str, help='Base URL to scrape')
+    parser.add_argument('--shards', type=int, default=os.cpu_count() or 1, help='Total number of shards')
+    parser.add_argument('--local_shards', type=str, default='all',
+                        help="Shards run on this machine, e.g. '0-3' (default: all)")
+    parser.add_argument('--listen', type=str, default='127.0.0.1:0',
+                        help='HOST:PORT the coordinator serves the shard queues on')
+    parser.add_argument('--connect', type=str, default=None,
+                        help="HOST:PORT of a running coordinator; run only --local_shards here")
+    parser.add_argument('--authkey', type=str, default=None,
+                        help='Shared secret for the shard queues (default: $CRAWL_AUTHKEY, else a random key for '
+                             'this run, which only local shards know)')
+    parser.add_argument('--depth', type=int, default=1, help='Depth of recursion for scraping')
+    parser.add_argument('--save_path', type=str, default='./scraped_data',
+                        help='Directory to save scraped data (one shard_NNN folder per shard)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Pages fetched in parallel per shard')
+    parser.add_argument('--delay', type=float, default=1.0, help='Minimum seconds between requests to the same host')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Read timeout in seconds for each request')
+    parser.add_argument('--parser', type=str, default='auto', help='HTML parser backend')
+    parser.add_argument('--parse_workers', type=int, default=0,
+                        help='Parser processes per shard (default 0: the shards already use the cores)')
+    parser.add_argument('--dedupe_distance', type=int, default=-1,
+                        help='Treat pages whose SimHash differs by at most this many bits as duplicates, e.g. 3 '
+                             '(default -1: off)')
+    parser.add_argument('--resume', action='store_true', help='Continue the crawl saved in save_path')
+
+    args = parser.parse_args()
+    # The queues speak pickle, so whoever holds the key can run code in the coordinator
+    authkey = (args.authkey or os.environ.get('CRAWL_AUTHKEY', '')).encode('utf-8')
+    if args.connect and not authkey:
+        parser.error("--connect needs the coordinator's --authkey (or $CRAWL_AUTHKEY)")
+    if not args.connect and not authkey and not is_loopback(parse_address(args.listen)[0]):
+        parser.error("listening on a non-loopback address needs an explicit --authkey (or $CRAWL_AUTHKEY)")
+    authkey = authkey or secrets.token_bytes(32)
+    options = dict(depth=args.depth, save_path=args.save_path, concurrency=args.concurrency, delay=args.delay,
+                   timeout=args.timeout, parser=args.parser, parse_workers=args.parse_workers,
+                   dedupe_distance=args.dedupe_distance, resume=args.resume)
+    indices = parse_indices(args.local_shards, args.shards)
+
+    if args.connect:  # Extra shards for a coordinator running elsewhere
+        processes = start_shards(indices, args.shards, parse_address(args.connect), authkey, args.url, options)
+        for process in processes:
+            process.join()
+    else:
+        manager = CrawlManager(address=parse_address(args.listen), authkey=authkey)
+        manager.start(_init_server, (args.shards,))
+        print(f"Coordinator listening on {manager.address[0]}:{manager.address[1]} for {args.shards} shards")
+        processes = start_shards(indices, args.shards, manager.address, authkey, args.url, options)
+        try:
+            wait_for_shards(manager, args.shards, processes)
+            for process in processes:
+                process.join()
+        finally:
+            manager.shutdown()
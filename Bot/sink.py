@@ -0,0 +1,214 @@
+# sink.py
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+TABLE_FORMATS = ['auto', 'parquet', 'arrow', 'csv']
+
+
+class RotatingFile:
+    """Append-only file split into numbered parts of at most `max_bytes`, optionally gzip-compressed."""
+
+    def __init__(self, directory: str, stem: str, extension: str, max_bytes: int, compress: bool = False,
+                 header: bytes = b''):
+        self.directory = directory
+        self.stem = stem
+        self.extension = extension + ('.gz' if compress else '')
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.header = header
+        self.part = self._last_part() + 1  # Never append to, or overwrite, an earlier run's parts
+        self._raw = None
+        self._out = None
+
+    def _last_part(self) -> int:
+        pattern = re.compile(rf'^{re.escape(self.stem)}\.(\d+)\.{re.escape(self.extension)}$')
+        parts = [int(m.group(1)) for m in map(pattern.match, os.listdir(self.directory)) if m]
+        return max(parts, default=0)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"{self.stem}.{self.part:05d}.{self.extension}")
+
+    def _open(self):
+        self._raw = open(self.path, 'ab')
+        self._out = gzip.GzipFile(fileobj=self._raw, mode='ab') if self.compress else self._raw
+        if self.header:
+            self._out.write(self.header)
+
+    def write(self, data: bytes) -> Tuple[str, int]:
+        """Appends data, starting a new part once the current one is full; returns (part path, offset written at)."""
+        if self._out is None:
+            self._open()
+        location = self.path, self._raw.tell()
+        self._out.write(data)
+        self._out.flush()
+        if self._raw.tell() >= self.max_bytes:
+            self.close()
+            self.part += 1
+        return location
+
+    def close(self):
+        if self._out is None:
+            return
+        if self._out is not self._raw:
+            self._out.close()
+        self._raw.close()
+        self._raw = self._out = None
+
+
+class RecordSink:
+    """Streams one record per page to JSONL and its links to CSV, flushing in batches.
+
+    Only the current batch is held in memory and each flush appends to the open
+    part, so memory and I/O per page stay constant however long the crawl runs.
+    """
+
+    def __init__(self, save_path: str, prefix: str = 'scraped_data', batch_size: int = 100,
+                 max_bytes: int = 100 * 1024 * 1024, compress: bool = False):
+        self.batch_size = max(1, batch_size)
+        self.json_file = RotatingFile(save_path, prefix, 'jsonl', max_bytes, compress)
+        self.csv_file = RotatingFile(save_path, f"{prefix}_links", 'csv', max_bytes, compress,
+                                     header=b'url,link\r\n')
+        self.written = 0
+        self._batch: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict):
+        """Queues a page record; the batch is written once it reaches batch_size."""
+        with self._lock:
+            self._batch.append(record)
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        """Writes any buffered records."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._batch:
+            return
+        lines = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self._batch)
+        rows = io.StringIO()
+        writer = csv.writer(rows)
+        for record in self._batch:
+            writer.writerows((record['url'], link) for link in record.get('links', []))
+
+        self.json_file.write(lines.encode('utf-8'))
+        self.csv_file.write(rows.getvalue().encode('utf-8'))
+        self.written += len(self._batch)
+        self._batch = []
+
+    def close(self):
+        """Flushes the last batch and closes the output files."""
+        with self._lock:
+            self._flush()
+            self.json_file.close()
+            self.csv_file.close()
+
+
+class TableSink:
+    """Streams extracted tables into column-oriented batches, one set of part files per column layout.
+
+    Rows are appended to per-column lists, never to per-row dicts; every
+    `batch_rows` rows of a layout are written as one Parquet or Arrow IPC file
+    (with pyarrow installed) or appended to a CSV part. Each row also carries
+    the page_url and table_index it came from.
+    """
+
+    def __init__(self, save_path: str, prefix: str = 'tables', batch_rows: int = 10000, fmt: str = 'auto',
+                 max_bytes: int = 100 * 1024 * 1024):
+        if fmt == 'auto':
+            fmt = 'parquet' if pyarrow is not None else 'csv'
+        if fmt in ('parquet', 'arrow') and pyarrow is None:
+            raise ValueError(f"The {fmt} table format needs `pip install pyarrow`.")
+        if fmt not in TABLE_FORMATS:
+            raise ValueError(f"Unknown table format '{fmt}'. Choose one of: {', '.join(TABLE_FORMATS)}")
+        self.save_path = save_path
+        self.prefix = prefix
+        self.batch_rows = max(1, batch_rows)
+        self.format = fmt
+        self.max_bytes = max_bytes
+        self.rows_written = 0
+        self._layouts: Dict[Tuple[str, ...], Tuple[RotatingFile, Dict[str, List]]] = {}
+        self._lock = threading.Lock()
+
+    def _layout(self, columns: List[str]) -> Tuple[RotatingFile, Dict[str, List]]:
+        names = ['page_url', 'table_index']
+        for column in columns:  # Keep the added columns from clashing with the table's own
+            while column in names:
+                column += '_'
+            names.append(column)
+        key = tuple(names)
+        if key not in self._layouts:
+            stem = f"{self.prefix}_{hashlib.sha1(json.dumps(names).encode('utf-8')).hexdigest()[:8]}"
+            if self.format == 'csv':
+                header = io.StringIO()
+                csv.writer(header).writerow(names)
+                out = RotatingFile(self.save_path, stem, 'csv', self.max_bytes,
+                                   header=header.getvalue().encode('utf-8'))
+            else:  # One self-contained file per batch
+                out = RotatingFile(self.save_path, stem, self.format, max_bytes=1)
+            self._layouts[key] = out, {name: [] for name in names}
+        return self._layouts[key]
+
+    def write(self, url: str, tables: List[Dict[str, List]]):
+        """Appends the rows of a page's tables ({'columns', 'rows'} each, see tables.parse_table)."""
+        with self._lock:
+            for index, table in enumerate(tables):
+                out, batch = self._layout(table['columns'])
+                columns = list(batch.values())
+                for row in table['rows']:
+                    columns[0].append(url)
+                    columns[1].append(index)
+                    for values, value in zip(columns[2:], row):
+                        values.append(value)
+                if len(columns[0]) >= self.batch_rows:
+                    self._write(out, batch)
+
+    def _write(self, out: RotatingFile, batch: Dict[str, List]):
+        count = len(batch['page_url'])
+        if not count:
+            return
+        if self.format == 'csv':
+            rows = io.StringIO()
+            csv.writer(rows).writerows(zip(*batch.values()))
+            out.write(rows.getvalue().encode('utf-8'))
+        else:
+            table = pyarrow.table(batch)
+            buffer = pyarrow.BufferOutputStream()
+            if self.format == 'parquet':
+                pyarrow.parquet.write_table(table, buffer, compression='zstd')
+            else:
+                with pyarrow.ipc.new_file(buffer, table.schema) as writer:
+                    writer.write_table(table)
+            out.write(buffer.getvalue().to_pybytes())
+        for values in batch.values():
+            values.clear()
+        self.rows_written += count
+
+    def flush(self):
+        """Writes every layout's buffered rows."""
+        with self._lock:
+            for out, batch in self._layouts.values():
+                self._write(out, batch)
+
+    def close(self):
+        with self._lock:
+            for out, batch in self._layouts.values():
+                self._write(out, batch)
+                out.close()
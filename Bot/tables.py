@@ -0,0 +1,110 @@
+# tables.py
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# (text, colspan, rowspan, is_header) for one <td>/<th>
+Cell = Tuple[str, int, int, bool]
+
+MAX_COLSPAN = 1000  # Browsers clamp spans to these as well
+MAX_ROWSPAN = 65534
+
+
+def _span(value, limit: int) -> int:
+    try:
+        return min(limit, max(1, int(str(value).strip())))
+    except (TypeError, ValueError):
+        return 1
+
+
+def soup_rows(table) -> Iterator[Tuple[bool, List[Cell]]]:
+    """(in <thead>, cells) for each row of a BeautifulSoup <table>, skipping rows of nested tables."""
+    for tr in table.find_all('tr'):
+        if tr.find_parent('table') is not table:
+            continue
+        cells = [(td.get_text(' ', strip=True), _span(td.get('colspan'), MAX_COLSPAN),
+                  _span(td.get('rowspan'), MAX_ROWSPAN), td.name == 'th')
+                 for td in tr.find_all(['td', 'th'], recursive=False)]
+        yield tr.parent.name == 'thead', cells
+
+
+def selectolax_rows(table) -> Iterator[Tuple[bool, List[Cell]]]:
+    """(in <thead>, cells) for each row of a selectolax <table> node, skipping rows of nested tables."""
+    for tr in table.css('tr'):
+        owner = tr.parent
+        while owner is not None and owner.tag != 'table':
+            owner = owner.parent
+        if owner is None or owner.mem_id != table.mem_id:
+            continue
+        cells = []
+        child = tr.child
+        while child is not None:
+            if child.tag in ('td', 'th'):
+                attrs = child.attributes
+                cells.append((child.text(separator=' ', strip=True), _span(attrs.get('colspan'), MAX_COLSPAN),
+                              _span(attrs.get('rowspan'), MAX_ROWSPAN), child.tag == 'th'))
+            child = child.next
+        yield tr.parent.tag == 'thead', cells
+
+
+def expand_spans(rows: List[List[Cell]]) -> List[List[Tuple[Optional[str], bool]]]:
+    """Lays rows out on a grid, repeating each spanning cell in every slot it covers."""
+    carried: Dict[int, List] = {}  # Column -> [rows still covered, text, is_header] of cells spanning down
+    grid = []
+    for cells in rows:
+        line: List[Tuple[Optional[str], bool]] = []
+        index = 0
+        while index < len(cells) or any(column >= len(line) for column in carried):
+            column = len(line)
+            if column in carried:
+                entry = carried[column]
+                line.append((entry[1], entry[2]))
+                entry[0] -= 1
+                if not entry[0]:
+                    del carried[column]
+                continue
+            if index >= len(cells):  # A gap left of a cell spanning down from above
+                line.append((None, False))
+                continue
+            text, colspan, rowspan, header = cells[index]
+            index += 1
+            for _ in range(colspan):
+                if rowspan > 1:
+                    carried[len(line)] = [rowspan - 1, text, header]
+                line.append((text, header))
+        grid.append(line)
+    return grid
+
+
+def parse_table(rows: Iterator[Tuple[bool, List[Cell]]]) -> Dict[str, List]:
+    """{'columns': names, 'rows': value lists} for a table, with spans expanded and every row as wide as the table.
+
+    Leading rows in <thead>, or made only of <th> cells, are header rows; a
+    column's name joins their texts with ' / '. Columns without one are named
+    column_1, column_2, ...
+    """
+    rows = list(rows)
+    grid = expand_spans([cells for _, cells in rows])
+    header_rows = 0
+    for (in_head, _), line in zip(rows, grid):
+        if not line or not (in_head or all(header for _, header in line)):
+            break
+        header_rows += 1
+    if header_rows == len(grid) and header_rows:  # All <th>: nothing but data really
+        header_rows = 1 if len(grid) > 1 else 0
+
+    width = max((len(line) for line in grid), default=0)
+    columns, seen = [], set()
+    for column in range(width):
+        parts: List[str] = []
+        for line in grid[:header_rows]:
+            text = line[column][0] if column < len(line) else None
+            if text and (not parts or parts[-1] != text):
+                parts.append(text)
+        name = ' / '.join(parts) or f"column_{column + 1}"
+        unique, suffix = name, 2
+        while unique in seen:
+            unique, suffix = f"{name}_{suffix}", suffix + 1
+        seen.add(unique)
+        columns.append(unique)
+
+    body = [[text for text, _ in line] + [None] * (width - len(line)) for line in grid[header_rows:]]
+    return {'columns': columns, 'rows': [row for row in body if any(value for value in row)]}
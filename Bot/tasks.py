@@ -0,0 +1,61 @@
+# tasks.py
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Worker threads per lane: one microphone and one speech engine, a little parallelism for the rest
+DEFAULT_LANES = {'asr': 1, 'inference': 1, 'tts': 1, 'device': 2}
+FRAME_MS = 16  # How often finished tasks are handed to the Tk thread (~60 fps)
+
+
+class TaskLanes:
+    """Runs blocking work (speech recognition, model inference, speech output, device I/O) off the Tk thread.
+
+    Each lane has its own thread pool, so a long inference never holds up
+    speech output or a bulb request. Callbacks are never run on the worker
+    threads: finished tasks are queued and their on_done/on_error callbacks
+    run on the Tk thread from a root.after() poll, where touching widgets is safe.
+    """
+
+    def __init__(self, root, lanes: Optional[Dict[str, int]] = None):
+        self.root = root
+        self.pools = {name: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+                      for name, workers in (lanes or DEFAULT_LANES).items()}
+        self._finished: queue.Queue = queue.Queue()
+        self._closed = False
+        self.root.after(FRAME_MS, self._deliver)
+
+    def submit(self, lane: str, fn: Callable, *args, on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None) -> Future:
+        """Runs fn(*args) on a lane; on_done(result) or on_error(exception) is later called on the Tk thread."""
+        future = self.pools[lane].submit(fn, *args)
+        future.add_done_callback(lambda f: self._finished.put((f, on_done, on_error)))
+        return future
+
+    def _deliver(self):
+        try:
+            while True:
+                future, on_done, on_error = self._finished.get_nowait()
+                if future.cancelled():
+                    continue
+                error = future.exception()
+                try:
+                    if error is None:
+                        if on_done is not None:
+                            on_done(future.result())
+                    elif on_error is not None:
+                        on_error(error)
+                    else:
+                        print(f"Error in background task: {error}")
+                except Exception as e:  # A failing callback must not stop delivery of the others
+                    print(f"Error in task callback: {e}")
+        except queue.Empty:
+            pass
+        if not self._closed:
+            self.root.after(FRAME_MS, self._deliver)
+
+    def close(self):
+        """Drops queued tasks; running ones finish in the background."""
+        self._closed = True
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,49 @@
+# test_extract.py
+import unittest
+
+from extract import HAS_LXML, HTMLParser, PageExtractor
+from schema import ExtractionSchema
+
+PAGE = """<html><head><title>Widget</title></head><body>
+<div id="product"><h1 class="name">Widget</h1><p class="price">120.5</p>
+<ul><li class="tag">blue</li><li class="tag">small</li></ul></div>
+<table class="outer"><tr><td><table class="specs"><tr><th>Weight</th><td>2 kg</td></tr></table></td></tr></table>
+</body></html>"""
+
+SCHEMA = ExtractionSchema.from_dict({
+    "name": {"selector": ".name"},
+    "price": {"selector": ".price", "type": "float"},
+    "product": {"selector": "#product", "attr": "id"},
+    "tags": {"selector": ".tag", "many": True},
+    "title": {"selector": "title"},
+})
+
+
+def installed_parsers():
+    parsers = ['html.parser']
+    if HAS_LXML:
+        parsers.append('lxml')
+    if HTMLParser is not None:
+        parsers.append('selectolax')
+    return parsers
+
+
+class SchemaBackendTest(unittest.TestCase):
+    """Every parser backend must extract the same row from the same page."""
+
+    def test_fields_match_on_every_backend(self):
+        expected = {'name': 'Widget', 'price': 120.5, 'product': 'product', 'tags': ['blue', 'small'],
+                    'title': 'Widget'}
+        for parser in installed_parsers():
+            with self.subTest(parser=parser):
+                self.assertEqual(PageExtractor(parser, schema=SCHEMA).extract(PAGE)['fields'], expected)
+
+    def test_tables_match_only_the_selected_table(self):
+        for parser in installed_parsers():
+            with self.subTest(parser=parser):
+                tables = PageExtractor(parser, tables='.specs').extract(PAGE)['tables']
+                self.assertEqual(len(tables), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# test_transport.py
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from transport import DownloadTimeout, Transport
+
+
+class DripHandler(BaseHTTPRequestHandler):
+    """Promises a 200000 byte body and sends it one byte every 10 ms."""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', '200000')
+        self.end_headers()
+        try:
+            for _ in range(200000):
+                self.wfile.write(b'x')
+                self.wfile.flush()
+                time.sleep(0.01)
+        except OSError:  # The client gave up
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class ReadBodyDeadlineTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), DripHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.transport = Transport()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_slow_drip_stops_at_deadline(self):
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        response = self.transport.get(url, stream=True)
+        start = time.perf_counter()
+        with self.assertRaises(DownloadTimeout):
+            self.transport.read_body(response, max_bytes=1024 * 1024, max_seconds=2.0)
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
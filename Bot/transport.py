@@ -0,0 +1,285 @@
+# transport.py
+import codecs
+import os
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+try:  # urllib3 only decodes brotli when one of these is installed
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+# Links with these extensions are never HTML, so they are not requested at all
+BINARY_EXTENSIONS = {'.apk', '.exe', '.msi', '.dmg', '.zip', '.gz', '.tgz', '.rar', '.7z', '.pdf', '.jpg', '.jpeg',
+                     '.png', '.gif', '.webp', '.svg', '.ico', '.mp3', '.mp4', '.avi', '.mov', '.webm', '.iso', '.bin',
+                     '.woff', '.woff2', '.ttf', '.css', '.js'}
+
+class BodyTooLarge(requests.RequestException):
+    """The response body is bigger than the configured limit."""
+
+
+class DownloadTimeout(requests.RequestException):
+    """Reading the response body took longer than the configured limit."""
+
+
+class RetryLater(requests.RequestException):
+    """The host asked for a longer pause than the crawler waits inline; the page should be queued again."""
+
+
+def looks_binary(url: str) -> bool:
+    """Whether the URL's path ends in an extension that is never HTML."""
+    return os.path.splitext(urlsplit(url).path)[1].lower() in BINARY_EXTENSIONS
+
+
+def is_html(response: requests.Response) -> bool:
+    """Whether the Content-Type is HTML; responses without one are let through to be sniffed."""
+    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    return not content_type or content_type in HTML_TYPES
+
+
+class DNSCache:
+    """Caches getaddrinfo() results per host for `ttl` seconds and counts new connections."""
+
+    def __init__(self, ttl: float = 300.0, metrics=None):
+        self.ttl = ttl
+        self.metrics = metrics  # Optional metrics.Metrics receiving 'dns' and 'connect' timings
+        self.hits = 0
+        self.misses = 0
+        self.connections = 0  # Sockets opened by the connections of the Transport that owns the cache
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Returns the addresses for host, from the cache while the entry is fresh."""
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        start = time.perf_counter()
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        if self.metrics is not None:
+            self.metrics.observe('dns', time.perf_counter() - start)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+        return addresses
+
+    def forget(self, host: str, port: int):
+        """Drops a host whose cached addresses stopped accepting connections."""
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+class _CachedDNSConnection:
+    """Connection mixin that resolves through the DNSCache of the Transport whose pools created it."""
+
+    dns_cache: DNSCache = None  # Set on the per-Transport subclasses made by DNSCachingAdapter
+
+    def _new_conn(self):
+        cache = self.dns_cache
+        host = self._dns_host
+        with cache._lock:
+            cache.connections += 1
+        try:
+            addresses = cache.resolve(host.strip('[]'), self.port)
+        except socket.gaierror:
+            return super()._new_conn()
+
+        try:
+            for ip in addresses:  # urllib3 connects to _dns_host; the TLS checks still use the real host name
+                self._dns_host = ip
+                start = time.perf_counter()
+                try:
+                    sock = super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError):
+                    continue
+                if cache.metrics is not None:
+                    cache.metrics.observe('connect', time.perf_counter() - start)
+                return sock
+        finally:
+            self._dns_host = host
+        cache.forget(host.strip('[]'), self.port)
+        return super()._new_conn()  # Fresh lookup
+
+
+class DNSCachingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections resolve host names through one DNSCache (not a process-wide patch)."""
+
+    def __init__(self, dns: DNSCache, **kwargs):
+        self.dns = dns
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        pools = {}
+        for scheme, pool_class in (('http', HTTPConnectionPool), ('https', HTTPSConnectionPool)):
+            connection_class = type(f"Cached{pool_class.ConnectionCls.__name__}",
+                                    (_CachedDNSConnection, pool_class.ConnectionCls), {'dns_cache': self.dns})
+            pools[scheme] = type(f"Cached{pool_class.__name__}", (pool_class,), {'ConnectionCls': connection_class})
+        self.poolmanager.pool_classes_by_scheme = pools
+
+
+class Transport:
+    """Pooled HTTP client for the scraper: keep-alive pools per host, cached DNS and compressed transfers."""
+
+    def __init__(self, pool_connections: int = 100, pool_maxsize: int = 10, connect_timeout: float = 5.0,
+                 read_timeout: float = 10.0, dns_ttl: float = 300.0, metrics=None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.metrics = metrics
+        self.dns = DNSCache(dns_ttl, metrics)  # Only this Transport's connections resolve (and are counted) here
+        # pool_connections is how many hosts keep a pool, pool_maxsize how many sockets each pool keeps alive
+        adapter = DNSCachingAdapter(self.dns, pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                    max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate'
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        """GETs a URL over a pooled connection.
+
+        With metrics attached, 'ttfb' gets the time until the headers were parsed
+        (including DNS and connect) and 'download' the time spent reading the body.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        with self._lock:
+            self.requests += 1
+        start = time.perf_counter()
+        response = self.session.get(url, headers=headers, **kwargs)
+        if self.metrics is not None:
+            ttfb = response.elapsed.total_seconds()
+            self.metrics.observe('ttfb', ttfb)
+            if not kwargs.get('stream'):
+                self.metrics.observe('download', max(0.0, time.perf_counter() - start - ttfb))
+                self.metrics.inc('bytes_downloaded', len(response.content))
+        return response
+
+    def head(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        """HEADs a URL over a pooled connection, following redirects."""
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('allow_redirects', True)
+        with self._lock:
+            self.requests += 1
+        return self.session.head(url, headers=headers, **kwargs)
+
+    def read_body(self, response: requests.Response, max_bytes: int, max_seconds: float,
+                  encoding: Optional[str] = None) -> Union[bytes, str]:
+        """Reads a streamed response in chunks, enforcing a size cap and a wall-clock deadline.
+
+        A Content-Length over the cap is refused before anything is read. With an
+        encoding the chunks are decoded as they arrive and a str is returned.
+        """
+        try:
+            length = int(response.headers.get('Content-Length', ''))
+        except ValueError:
+            length = None
+        if length is not None and length > max_bytes:
+            response.close()
+            raise BodyTooLarge(f"{response.url} is {length} bytes, over the {max_bytes} byte limit")
+
+        decoder = None
+        if encoding:
+            try:
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            except LookupError:  # Unknown charset label
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        chunks = []
+        size = 0
+        start = time.perf_counter()
+        deadline = start + max_seconds
+        # A read blocks until a whole chunk (or the read timeout) arrives, so a server dripping bytes would
+        # outlast a deadline checked between chunks; the watchdog cuts the connection when it passes instead.
+        expired = threading.Event()
+        watchdog = threading.Timer(max_seconds, self._abort, args=(response, expired))
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise BodyTooLarge(f"{response.url} exceeded the {max_bytes} byte limit")
+                if expired.is_set() or time.perf_counter() > deadline:
+                    raise DownloadTimeout(f"{response.url} took over {max_seconds}s to download")
+                chunks.append(decoder.decode(chunk) if decoder else chunk)
+        except (BodyTooLarge, DownloadTimeout):
+            raise
+        except (requests.RequestException, OSError, ValueError, AttributeError):
+            if expired.is_set():  # The read failed because the watchdog cut the connection
+                raise DownloadTimeout(f"{response.url} took over {max_seconds}s to download") from None
+            raise
+        finally:
+            watchdog.cancel()
+            response.close()
+        if expired.is_set():  # The cut connection can also look like a short, complete body
+            raise DownloadTimeout(f"{response.url} took over {max_seconds}s to download")
+
+        if self.metrics is not None:
+            self.metrics.observe('download', time.perf_counter() - start)
+            self.metrics.inc('bytes_downloaded', size)
+        if decoder:
+            chunks.append(decoder.decode(b'', final=True))
+            return ''.join(chunks)
+        return b''.join(chunks)
+
+    @staticmethod
+    def discard(response: requests.Response, max_bytes: int = 64 * 1024):
+        """Closes a response whose body is not wanted, keeping the connection for reuse when the body is small.
+
+        Closing a stream that was not read to its end makes urllib3 drop the
+        socket, so a 304 or a short body is drained first.
+        """
+        length = response.headers.get('Content-Length', '')
+        if response.status_code in (204, 304) or (length.isdigit() and int(length) <= max_bytes):
+            response.raw.drain_conn()  # Swallows read errors; the connection is then simply dropped
+        response.close()
+
+    @staticmethod
+    def _abort(response: requests.Response, expired: threading.Event):
+        """Unblocks a read in progress on another thread by shutting the response's socket down."""
+        expired.set()
+        sock = getattr(getattr(response.raw, '_connection', None), 'sock', None)
+        if sock is None:  # urllib3 2 hands the socket over to the http.client response it reads from
+            reader = getattr(getattr(response.raw, '_fp', None), 'fp', None)
+            sock = getattr(getattr(reader, 'raw', None), '_sock', None)
+        if sock is not None:  # close() would wait for the reading thread; shutdown() wakes it up
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        """Connection reuse and DNS cache counters."""
+        reused = max(0, self.requests - self.dns.connections)
+        return {
+            'requests': self.requests,
+            'connections_opened': self.dns.connections,
+            'connections_reused': reused,
+            'reuse_ratio': reused / self.requests if self.requests else 0.0,
+            'dns_hits': self.dns.hits,
+            'dns_misses': self.dns.misses,
+        }
+
+    def close(self):
+        """Closes every pooled connection."""
+        self.session.close()
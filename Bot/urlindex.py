@@ -0,0 +1,182 @@
+# urlindex.py
+import hashlib
+import math
+import re
+from array import array
+from typing import Iterable, Optional
+from urllib.parse import quote, unquote_plus, urljoin, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from and never change the page
+TRACKING_PARAMS = {'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid', '_ga', '_gl', 'igshid'}
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+UNRESERVED = set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+_ESCAPE = re.compile(r'%([0-9A-Fa-f]{2})')
+QUERY_SAFE = "%/?:@!$'()*+,;-._~"  # '&' and '=' delimit the parameters, so inside one they stay escaped
+
+
+def _normalize_escapes(text: str, safe: str = "%/:@!$&'()*+,;=-._~") -> str:
+    """Decodes escaped unreserved characters, uppercases the other escapes and escapes raw non-ASCII."""
+    def fix(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED else '%' + match.group(1).upper()
+    return quote(_ESCAPE.sub(fix, text), safe=safe)
+
+
+def _remove_dot_segments(path: str) -> str:
+    """Resolves '.' and '..' segments (RFC 3986 section 5.2.4), so /a/../b and /b are one path."""
+    if '.' not in path:
+        return path
+    output = []
+    segments = path.split('/')
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == '.':
+            if last:
+                output.append('')
+        elif segment == '..':
+            if len(output) > 1:
+                output.pop()
+            if last:
+                output.append('')
+        else:
+            output.append(segment)
+    return '/'.join(output) if output[:1] == [''] else '/' + '/'.join(output)
+
+
+def _normalize_query(query: str) -> str:
+    """Sorts the parameters and drops tracking ones, keeping each one as written: ?x stays ?x, not ?x=."""
+    params = []
+    for param in query.split('&'):
+        if not param:
+            continue
+        key, equals, value = param.partition('=')
+        name = unquote_plus(key).lower()
+        if name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES):
+            continue
+        params.append((_normalize_escapes(key, QUERY_SAFE), equals, _normalize_escapes(value, QUERY_SAFE)))
+    params.sort()
+    return '&'.join(key + equals + value for key, equals, value in params)
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """Canonical form of a URL, resolved against base; None for non-HTTP links.
+
+    Lowercases the scheme and host, drops default ports, fragments and tracking
+    parameters (utm_*, gclid, fbclid, ...), removes dot segments, sorts the
+    remaining query parameters and normalizes percent-escapes, so variants of
+    one page map to one string.
+    """
+    url = url.strip()
+    if base:
+        url = urljoin(base, url)
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower().rstrip('.')
+    try:
+        host = host.encode('idna').decode('ascii')
+    except UnicodeError:
+        pass
+    if ':' in host:  # IPv6 literal
+        host = f"[{host}]"
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = _normalize_escapes(_remove_dot_segments(parts.path)) or '/'
+    return urlunsplit((scheme, host, path, _normalize_query(parts.query), ''))
+
+
+def fingerprint(url: str) -> int:
+    """64-bit fingerprint of a URL string (never 0, which marks an empty slot)."""
+    value = int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for `capacity` items at the given false-positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(self.size // 8 + 1)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class VisitedIndex:
+    """Set-like visited index that stores 8-byte fingerprints instead of URL strings.
+
+    Fingerprints live in an open-addressing table backed by array('Q'), 12-24
+    bytes per URL against well over 100 for a set of strings. When max_exact is
+    set and a Bloom capacity is given, URLs past max_exact go to a Bloom filter,
+    so memory stops growing at the cost of a small false-positive rate.
+    """
+
+    def __init__(self, max_exact: Optional[int] = None, bloom_capacity: int = 0, bloom_error: float = 0.001):
+        self.max_exact = max_exact
+        self.bloom = BloomFilter(bloom_capacity, bloom_error) if bloom_capacity else None
+        self._slots = array('Q', bytes(8 * 1024))
+        self._mask = len(self._slots) - 1
+        self._exact = 0
+        self._spilled = 0
+
+    def __len__(self) -> int:
+        return self._exact + self._spilled
+
+    def _find(self, fp: int) -> int:
+        """Index of fp's slot, or of the empty slot where it would go."""
+        slots, mask = self._slots, self._mask
+        i = fp & mask
+        while slots[i] and slots[i] != fp:
+            i = (i + 1) & mask
+        return i
+
+    def _grow(self):
+        old = self._slots
+        self._slots = array('Q', bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        for fp in old:
+            if fp:
+                self._slots[self._find(fp)] = fp
+
+    def __contains__(self, url: str) -> bool:
+        if self._slots[self._find(fingerprint(url))]:
+            return True
+        return self.bloom is not None and url in self.bloom
+
+    def add(self, url: str):
+        fp = fingerprint(url)
+        i = self._find(fp)
+        if self._slots[i]:
+            return
+        if self.bloom is not None and self.max_exact is not None and self._exact >= self.max_exact:
+            if url not in self.bloom:
+                self.bloom.add(url)
+                self._spilled += 1
+            return
+        self._slots[i] = fp
+        self._exact += 1
+        if self._exact * 3 > len(self._slots) * 2:  # Keep the load factor under 2/3
+            self._grow()
+
+    def update(self, urls: Iterable[str]):
+        for url in urls:
+            self.add(url)
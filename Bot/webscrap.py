@@ -1,168 +1,688 @@
-# web_scraper.py
-import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
-import random
-import time
-import json
-import csv
-import os
-
-class WebScraper:
-    def __init__(self, base_url: str, depth: int = 1, save_path: str = './scraped_data'):
-        self.base_url = base_url
-        self.depth = depth
-        self.save_path = save_path
-        self.soup = None
-        self.visited_urls = set()  # Keep track of visited URLs to avoid cycles
-        self.user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Gecko/20100101 Firefox/60.0',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_14_6) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.132 Safari/537.3',
-            'Mozilla/5.0 (Linux; Android 10; Pixel 3 XL) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.119 Mobile Safari/537.36',
-        ]
-        self.setup_save_path()
-
-    def setup_save_path(self):
-        """Create a directory for saving scraped data."""
-        os.makedirs(self.save_path, exist_ok=True)
-
-    def fetch_page(self, url: Optional[str] = None) -> bool:
-        """Fetches the HTML content of the page."""
-        try:
-            headers = {'User-Agent': random.choice(self.user_agents)}
-            response = requests.get(url or self.base_url, headers=headers, timeout=10)
-            response.raise_for_status()  # Check if the request was successful
-            self.soup = BeautifulSoup(response.text, 'html.parser')
-            return True
-        except requests.RequestException as e:
-            print(f"Error fetching page: {e}")
-            return False
-
-    def get_all_links(self) -> List[str]:
-        """Extracts all links (anchor tags) from the page."""
-        if self.soup is None:
-            print("Page not fetched. Use fetch_page() first.")
-            return []
-        
-        links = [a.get('href') for a in self.soup.find_all('a', href=True)]
-        return [link for link in links if link.startswith(('http', 'https'))]  # Filter only valid URLs
-
-    def get_all_images(self) -> List[str]:
-        """Extracts all image URLs from the page."""
-        if self.soup is None:
-            print("Page not fetched. Use fetch_page() first.")
-            return []
-        
-        images = [img.get('src') for img in self.soup.find_all('img', src=True)]
-        return images
-
-    def get_text(self, selector: str) -> str:
-        """Extracts text based on a CSS selector."""
-        if self.soup is None:
-            print("Page not fetched. Use fetch_page() first.")
-            return ""
-        
-        element = self.soup.select_one(selector)
-        return element.get_text(strip=True) if element else ""
-
-    def get_data_table(self, table_selector: str) -> List[Dict[str, str]]:
-        """Extracts a data table based on the provided selector."""
-        if self.soup is None:
-            print("Page not fetched. Use fetch_page() first.")
-            return []
-        
-        table_data = []
-        table = self.soup.select_one(table_selector)
-        if not table:
-            print("No table found with the given selector.")
-            return table_data
-
-        headers = [th.get_text(strip=True) for th in table.find_all('th')]
-        for row in table.find_all('tr')[1:]:
-            row_data = {headers[i]: td.get_text(strip=True) for i, td in enumerate(row.find_all('td'))}
-            table_data.append(row_data)
-        
-        return table_data
-
-    def get_metadata(self) -> Dict[str, str]:
-        """Extracts meta tags content from the page."""
-        if self.soup is None:
-            print("Page not fetched. Use fetch_page() first.")
-            return {}
-        
-        meta_data = {}
-        for meta in self.soup.find_all('meta'):
-            name = meta.get('name') or meta.get('property')
-            content = meta.get('content')
-            if name and content:
-                meta_data[name] = content
-        return meta_data
-    
-    def filter_links(self, keyword: str) -> List[str]:
-        """Filters links containing the specified keyword."""
-        return [link for link in self.get_all_links() if keyword in link]
-
-    def save_to_json(self, data: Dict, filename: str):
-        """Saves the scraped data to a JSON file."""
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
-
-    def save_to_csv(self, data: List[Dict[str, str]], filename: str):
-        """Saves the scraped data to a CSV file."""
-        keys = data[0].keys() if data else []
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            dict_writer = csv.DictWriter(f, fieldnames=keys)
-            dict_writer.writeheader()
-            dict_writer.writerows(data)
-
-    def scrape_recursive(self, url: str, current_depth: int):
-        """Recursively scrape pages to a specified depth."""
-        if current_depth > self.depth or url in self.visited_urls:
-            return
-
-        self.visited_urls.add(url)
-
-        if self.fetch_page(url):
-            print(f"Scraping: {url}")
-            time.sleep(1)  # Sleep to avoid overwhelming the server
-            
-            # Collect data
-            data = {
-                'url': url,
-                'links': self.get_all_links(),
-                'images': self.get_all_images(),
-                'metadata': self.get_metadata(),
-            }
-
-            # Save data to JSON and CSV
-            json_filename = os.path.join(self.save_path, f"scraped_data_{current_depth}.json")
-            csv_filename = os.path.join(self.save_path, f"scraped_data_{current_depth}.csv")
-            self.save_to_json(data, json_filename)
-            print(f"Data saved as JSON for {url} at {json_filename}")
-            
-            # Optionally, save links, images, and metadata as well
-            self.save_to_csv([{'url': url, 'link': link} for link in data['links']], csv_filename)
-            print(f"Links saved as CSV for {url} at {csv_filename}")
-
-            # Recursively scrape each link found on this page
-            for link in self.get_all_links():
-                self.scrape_recursive(link, current_depth + 1)
-
-# Example usage
-if __name__ == "__main__":
-    import argparse
-
-    parser = argparse.ArgumentParser(description='Web Scraper')
-    parser.add_argument('url', type=str, help='Base URL to scrape')
-    parser.add_argument('--depth', type=int, default=1, help='Depth of recursion for scraping')
-    parser.add_argument('--save_path', type=str, default='./scraped_data', help='Directory to save scraped data')
-
-    args = parser.parse_args()
-
-    # Initialize the scraper with a base URL
-    scraper = WebScraper(args.url, depth=args.depth, save_path=args.save_path)
-
-    # Start scraping
-    scraper.scrape_recursive(args.url, 1)
-
+# web_scraper.py
+import requests
+from bs4 import BeautifulSoup
+from typing import Callable, List, Dict, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from politeness import HostScheduler, parse_retry_after
+from frontier import DEFAULT_RULES, FrontierScorer, parse_rule
+from transport import RetryLater, Transport, is_html, looks_binary
+from extract import PARSERS, PageExtractor, decode_body, extract_in_worker, init_worker
+from sink import TABLE_FORMATS, RecordSink, TableSink
+from checkpoint import CrawlStore
+from urlindex import VisitedIndex, normalize_url
+from dedupe import SimHashIndex
+from robots import RobotsCache
+from metrics import Metrics, timed
+from recrawl import PageHistory
+from schema import ExtractionSchema
+from archive import PageArchive
+from assets import AssetDownloader
+from tables import parse_table, soup_rows
+import hashlib
+import random
+import time
+import json
+import csv
+import os
+
+class WebScraper:
+    def __init__(self, base_url: str, depth: int = 1, save_path: str = './scraped_data', concurrency: int = 8,
+                 delay: float = 1.0, max_retries: int = 2, pool_size: int = 10, timeout: float = 10.0,
+                 parser: str = 'auto', selectors: Optional[Dict[str, str]] = None,
+                 batch_size: int = 100, max_file_mb: int = 100, compress: bool = False,
+                 checkpoint_interval: float = 30.0, visited_max: Optional[int] = None, bloom_capacity: int = 0,
+                 parse_workers: Optional[int] = None, dedupe_distance: int = -1,
+                 sitemap_limit: int = 0, metrics_file: Optional[str] = None, progress_interval: float = 10.0,
+                 incremental: bool = False, min_revisit_hours: float = 1.0, max_revisit_days: float = 30.0,
+                 max_page_mb: float = 10.0, max_page_seconds: float = 30.0,
+                 schema: Optional[ExtractionSchema] = None, tables: Optional[str] = None,
+                 table_format: str = 'auto', table_batch_rows: int = 10000, best_first: bool = False,
+                 url_rules: Optional[List[Tuple[str, float]]] = None, max_pages: int = 0, archive: bool = False,
+                 archive_segment_mb: int = 1024, download_assets: bool = False, asset_workers: int = 4,
+                 asset_max_mb: float = 5.0, asset_types: str = 'image/'):
+        self.base_url = base_url
+        self.depth = depth
+        self.save_path = save_path
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.max_page_bytes = int(max_page_mb * 1024 * 1024)  # Bodies are streamed and cut off past these limits
+        self.max_page_seconds = max_page_seconds
+        self.scheduler = HostScheduler(delay=delay)  # Per-host politeness and frontier
+        # Best-first order: link-graph importance, depth, host diversity and URL rules instead of depth alone
+        self.scorer = FrontierScorer(rules=DEFAULT_RULES + list(url_rules or [])) if best_first else None
+        self.max_pages = max_pages  # Page budget of a crawl (0: unlimited)
+        self.metrics = Metrics()  # Stage timings and counters, dumped to metrics_file
+        self.metrics_file = metrics_file
+        self.progress_interval = progress_interval
+        self.router = None  # Set by shard.py to hand links of other shards' hosts over to them
+        # Keep-alive pools and DNS cache
+        self.transport = Transport(pool_maxsize=pool_size, read_timeout=timeout, metrics=self.metrics)
+        self.robots = RobotsCache(self._get)  # robots.txt rules and sitemaps per host
+        self.sitemap_limit = sitemap_limit  # URLs seeded from the start host's sitemaps
+        self.sitemap_lastmod: Dict[str, str] = {}
+        # Near-duplicate pages (SimHash within dedupe_distance bits) are recorded by reference only
+        self.dedupe = SimHashIndex(dedupe_distance) if dedupe_distance >= 0 else None
+        # One DOM walk per page; the schema's selectors are compiled once here
+        self.extractor = PageExtractor(parser, selectors, fingerprint=self.dedupe is not None, schema=schema,
+                                       tables=tables)
+        # Processes parsing fetched pages; 0 parses on the fetcher threads instead
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self.soup = None
+        self.page_url = None  # URL of the page in self.soup, for resolving relative links
+        # Keep track of visited URLs to avoid cycles; holds 64-bit fingerprints of normalized URLs
+        self.visited_urls = VisitedIndex(max_exact=visited_max, bloom_capacity=bloom_capacity)
+        self.user_agents = [
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Gecko/20100101 Firefox/60.0',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_14_6) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.132 Safari/537.3',
+            'Mozilla/5.0 (Linux; Android 10; Pixel 3 XL) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.119 Mobile Safari/537.36',
+        ]
+        self.setup_save_path()
+        # Streams every page to append-only JSONL/CSV parts under save_path
+        self.sink = RecordSink(self.save_path, batch_size=batch_size, max_bytes=max_file_mb * 1024 * 1024,
+                               compress=compress)
+        # Rows of the tables matching `tables`, in columnar batches (Parquet/Arrow with pyarrow, else CSV)
+        self.table_sink = None
+        if tables:
+            self.table_sink = TableSink(self.save_path, batch_rows=table_batch_rows, fmt=table_format,
+                                        max_bytes=max_file_mb * 1024 * 1024)
+        # Raw responses, for re-extraction without re-fetching (python archive.py reprocess)
+        self.archive = None
+        if archive:
+            self.archive = PageArchive(os.path.join(self.save_path, 'archive'), max_segment_mb=archive_segment_mb)
+        # Images (or other asset types) of saved pages, stored once per distinct content under save_path/assets
+        self.assets = None
+        if download_assets:
+            self.assets = AssetDownloader(os.path.join(self.save_path, 'assets'), self.transport, self.scheduler,
+                                          workers=asset_workers, max_bytes=int(asset_max_mb * 1024 * 1024),
+                                          max_seconds=max_page_seconds,
+                                          types=tuple(t for t in asset_types.split(',') if t), robots=self.robots,
+                                          headers=lambda: {'User-Agent': random.choice(self.user_agents)},
+                                          metrics=self.metrics)
+        # Frontier and visited set survive a crash here; see crawl(resume=True)
+        self.store = CrawlStore(os.path.join(self.save_path, 'crawl_state.sqlite'), interval=checkpoint_interval)
+        # Incremental mode: validators, content hashes and change rates kept across runs
+        self.history = None
+        if incremental:
+            self.history = PageHistory(os.path.join(self.save_path, 'page_history.sqlite'),
+                                       min_interval=min_revisit_hours * 3600,
+                                       max_interval=max_revisit_days * 86400)
+
+    def setup_save_path(self):
+        """Create a directory for saving scraped data."""
+        os.makedirs(self.save_path, exist_ok=True)
+
+    def fetch_page(self, url: Optional[str] = None) -> bool:
+        """Fetches the HTML content of the page."""
+        url = url or self.base_url
+        soup = self.download_page(url)
+        if soup is None:
+            return False
+        self.soup = soup
+        self.page_url = url
+        return True
+
+    def download_page(self, url: str) -> Optional[BeautifulSoup]:
+        """Fetches and parses a page without touching self.soup, so it is safe to call from fetcher threads."""
+        html = self.download_html(url)
+        return self.extractor.make_soup(html) if html is not None else None
+
+    def download_html(self, url: str) -> Union[None, str, bytes]:
+        """Fetches the raw HTML of a page, as bytes for the parser to sniff when no charset is declared."""
+        try:
+            response = self.request(url)
+            response.raise_for_status()  # Check if the request was successful
+            if not self.accept_html(response):
+                return None
+            if self.archive is None:
+                return self.transport.read_body(response, self.max_page_bytes, self.max_page_seconds,
+                                                self.declared_encoding(response))
+            body = self.transport.read_body(response, self.max_page_bytes, self.max_page_seconds)
+            self.archive.write(url, response, body)
+            return decode_body(body, self.declared_encoding(response))
+        except requests.RequestException as e:
+            print(f"Error fetching page: {e}")
+            return None
+
+    def accept_html(self, response: requests.Response) -> bool:
+        """Closes and skips responses that are not HTML, before their body is downloaded."""
+        if is_html(response):
+            return True
+        self.transport.discard(response)
+        self.metrics.inc('skipped', reason='content_type')
+        print(f"Skipping non-HTML page: {response.url} ({response.headers.get('Content-Type')})")
+        return False
+
+    @staticmethod
+    def declared_encoding(response: requests.Response) -> Optional[str]:
+        """The charset from the Content-Type header, if there is one."""
+        declared = 'charset=' in response.headers.get('Content-Type', '').lower()
+        return response.encoding if declared else None
+
+    def download_body(self, url: str) -> Union[None, List[str], Tuple[bytes, Optional[str]]]:
+        """Fetches the raw bytes of a page with the charset its headers declare, if any.
+
+        In incremental mode the request is conditional, and a page that is unchanged
+        (304, or the same content hash) returns the links stored for it instead.
+        """
+        record = self.history.get(url) if self.history is not None else None
+        try:
+            response = self.request(url, PageHistory.conditional_headers(record))
+            if response.status_code == 304 and record is not None:
+                self.transport.discard(response)  # Keeps the connection: a re-crawl is mostly 304s
+                self.history.observe(url, changed=False)
+                self.metrics.inc('unchanged', reason='not_modified')
+                return record.links
+            response.raise_for_status()  # Check if the request was successful
+            if not self.accept_html(response):
+                return None
+            body = self.transport.read_body(response, self.max_page_bytes, self.max_page_seconds)
+        except RetryLater:
+            raise  # The crawl loop queues the page again
+        except requests.RequestException as e:
+            print(f"Error fetching page: {e}")
+            return None
+        if self.archive is not None:
+            self.archive.write(url, response, body)
+
+        if self.history is not None:
+            digest = hashlib.sha1(body).hexdigest()
+            changed = record is None or digest != record.content_hash
+            self.history.observe(url, changed, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                                 digest)
+            if not changed:
+                self.metrics.inc('unchanged', reason='same_hash')
+                return record.links
+        return body, self.declared_encoding(response)
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        return self.transport.get(url, headers={'User-Agent': random.choice(self.user_agents)}, **kwargs)
+
+    def request(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """GETs a URL, feeding the outcome back to the per-host scheduler and retrying on 429/503.
+
+        The response is streamed: the caller reads the body (see Transport.read_body) or closes it.
+        """
+        if not self.robots.allowed(url):
+            self.metrics.inc('robots_disallowed')
+            raise requests.RequestException(f"Disallowed by robots.txt: {url}")
+        if self.scheduler.claim_robots(url):
+            self.scheduler.set_crawl_delay(url, self.robots.crawl_delay(url))
+
+        for attempt in range(self.max_retries + 1):
+            request_headers = {'User-Agent': random.choice(self.user_agents), **(headers or {})}
+            start = time.monotonic()
+            try:
+                response = self.transport.get(url, headers=request_headers, stream=True)
+            except requests.RequestException:
+                self.scheduler.record(url, None, time.monotonic() - start)
+                self.metrics.inc('fetch_errors')
+                raise
+            self.metrics.inc('responses', status=str(response.status_code))
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.scheduler.record(url, response.status_code, time.monotonic() - start, retry_after)
+            if response.status_code not in (429, 503) or attempt == self.max_retries:
+                return response
+            self.transport.discard(response)
+            if not self.scheduler.wait_turn(url):
+                raise RetryLater(f"{url}: the host asked for a pause over {self.scheduler.max_delay:.0f}s")
+
+    @timed('extract')
+    def get_all_links(self, soup: Optional[BeautifulSoup] = None) -> List[str]:
+        """Extracts all links (anchor tags) from the page."""
+        soup = soup if soup is not None else self.soup
+        if soup is None:
+            print("Page not fetched. Use fetch_page() first.")
+            return []
+        
+        base = self.page_url or self.base_url
+        links = [normalize_url(a.get('href'), base) for a in soup.find_all('a', href=True)]
+        return [link for link in links if link]  # Relative links resolved, non-HTTP ones dropped
+
+    @timed('extract')
+    def get_all_images(self, soup: Optional[BeautifulSoup] = None) -> List[str]:
+        """Extracts all image URLs from the page."""
+        soup = soup if soup is not None else self.soup
+        if soup is None:
+            print("Page not fetched. Use fetch_page() first.")
+            return []
+        
+        images = [img.get('src') for img in soup.find_all('img', src=True)]
+        return images
+
+    @timed('extract')
+    def get_text(self, selector: str) -> str:
+        """Extracts text based on a CSS selector."""
+        if self.soup is None:
+            print("Page not fetched. Use fetch_page() first.")
+            return ""
+        
+        element = self.soup.select_one(selector)
+        return element.get_text(strip=True) if element else ""
+
+    @timed('extract')
+    def get_fields(self) -> Dict:
+        """Extracts every schema field from the fetched page in one pass."""
+        if self.soup is None:
+            print("Page not fetched. Use fetch_page() first.")
+            return {}
+        return self.extractor.extract_fields(self.soup, self.page_url or self.base_url)
+
+    @timed('extract')
+    def get_data_table(self, table_selector: str) -> List[Dict[str, str]]:
+        """Extracts a data table based on the provided selector, repeating colspan/rowspan cells in each slot."""
+        if self.soup is None:
+            print("Page not fetched. Use fetch_page() first.")
+            return []
+        
+        table = self.soup.select_one(table_selector)
+        if not table:
+            print("No table found with the given selector.")
+            return []
+
+        parsed = parse_table(soup_rows(table))  # Columnar; see the tables option for whole crawls
+        return [dict(zip(parsed['columns'], row)) for row in parsed['rows']]
+
+    @timed('extract')
+    def get_metadata(self, soup: Optional[BeautifulSoup] = None) -> Dict[str, str]:
+        """Extracts meta tags content from the page."""
+        soup = soup if soup is not None else self.soup
+        if soup is None:
+            print("Page not fetched. Use fetch_page() first.")
+            return {}
+        
+        meta_data = {}
+        for meta in soup.find_all('meta'):
+            name = meta.get('name') or meta.get('property')
+            content = meta.get('content')
+            if name and content:
+                meta_data[name] = content
+        return meta_data
+    
+    def download_images(self) -> Dict[str, Optional[str]]:
+        """Downloads the images of the fetched page concurrently; maps each image URL to its stored path."""
+        if self.assets is None:
+            print("Asset downloads are off. Create the scraper with download_assets=True.")
+            return {}
+        images = self.get_all_images()
+        return self.assets.results(self.assets.submit(self.page_url or self.base_url, images))
+
+    def filter_links(self, keyword: str) -> List[str]:
+        """Filters links containing the specified keyword."""
+        return [link for link in self.get_all_links() if keyword in link]
+
+    @timed('save')
+    def save_to_json(self, data: Dict, filename: str):
+        """Saves the scraped data to a JSON file."""
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=4)
+
+    @timed('save')
+    def save_to_csv(self, data: List[Dict[str, str]], filename: str):
+        """Saves the scraped data to a CSV file."""
+        keys = data[0].keys() if data else []
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            dict_writer = csv.DictWriter(f, fieldnames=keys)
+            dict_writer.writeheader()
+            dict_writer.writerows(data)
+
+    def scrape_page(self, url: str, current_depth: int) -> List[str]:
+        """Fetches one page, saves its data and returns the links found on it."""
+        fetched = self.download_body(url)
+        if fetched is None:
+            return []
+        if isinstance(fetched, list):  # Unchanged since the last crawl
+            return fetched
+
+        # Collect data in a single pass over the page
+        with self.metrics.timer('parse'):
+            extracted = self.extractor.extract(decode_body(*fetched), url)
+        return self.save_page(url, current_depth, extracted)
+
+    def save_page(self, url: str, current_depth: int, extracted: Dict) -> List[str]:
+        """Saves the data extracted from a page and returns its links."""
+        signature = extracted.get('simhash')
+        if self.dedupe is not None and signature is not None:
+            original = self.dedupe.add_or_find(signature, url)
+            if original is not None:
+                print(f"Skipping near-duplicate: {url} (of {original})")
+                self.metrics.inc('duplicates')
+                self.sink.write({'url': url, 'depth': current_depth, 'duplicate_of': original})
+                return []  # Its links were already expanded from the original
+
+        print(f"Scraping: {url}")
+        links = extracted['links']
+        data = {
+            'url': url,
+            'depth': current_depth,
+            'links': links,
+            'images': extracted['images'],
+            'metadata': extracted['metadata'],
+        }
+        if self.table_sink is not None and extracted.get('tables'):
+            self.table_sink.write(url, extracted['tables'])
+            data['tables'] = len(extracted['tables'])
+        if self.assets is not None:
+            self.assets.submit(url, extracted['images'])  # Downloaded in the background, once per URL
+        if self.extractor.schema:
+            data['fields'] = extracted['fields']
+        if url in self.sitemap_lastmod:
+            data['lastmod'] = self.sitemap_lastmod[url]
+        if self.history is not None:
+            self.history.set_links(url, links)
+
+        # Append the page to the JSONL record stream and its links to the CSV stream
+        with self.metrics.timer('save'):
+            self.sink.write(data)
+        self.metrics.inc('pages_saved')
+        return links
+
+    def seed_from_sitemaps(self, url: str, depth: int, enqueue: Callable[[str, int], bool]) -> int:
+        """Queues up to sitemap_limit URLs from the sitemaps of url's host; returns how many."""
+        seeded = 0
+        for sitemap in self.robots.sitemaps(url):
+            for loc, lastmod in self.robots.iter_sitemap(sitemap):
+                if seeded >= self.sitemap_limit:
+                    return seeded
+                if enqueue(loc, depth):
+                    seeded += 1
+                    if lastmod:
+                        self.sitemap_lastmod[normalize_url(loc)] = lastmod
+        return seeded
+
+    def checkpoint(self):
+        """Flushes saved pages, then persists the frontier and visited set."""
+        self.sink.flush()  # Pages marked done must already be on disk
+        if self.table_sink is not None:
+            self.table_sink.flush()
+        if self.archive is not None:
+            self.archive.commit()
+        self.store.checkpoint()
+        if self.history is not None:
+            self.history.commit()
+        if self.metrics_file:
+            self.metrics.dump(self.metrics_file)
+
+    def report_progress(self, queued: int, in_flight: int):
+        """Prints crawl rate and frontier size."""
+        saved = self.metrics.total('pages_saved')
+        elapsed = time.monotonic() - self.metrics.started
+        print(f"Progress: {saved:.0f} pages ({saved / elapsed if elapsed else 0:.1f}/s), "
+              f"frontier: {queued}, in flight: {in_flight}")
+
+    def crawl(self, start_url: Optional[str] = None, start_depth: int = 1, resume: bool = False):
+        """Breadth-first crawl to the configured depth using a pool of concurrent fetchers.
+
+        Each host has its own queue in the scheduler (shallowest pages first), and a
+        URL is only handed to a fetcher once its host's politeness interval allows it.
+        With resume=True the frontier and visited set of the last run in save_path are
+        restored instead of starting from start_url. With a router (see shard.py) the
+        crawl only fetches the hosts of its shard and runs until the coordinator stops it.
+        With best_first the queues are ordered by FrontierScorer instead of depth, so a
+        max_pages budget is spent on the best-linked pages first.
+        """
+        frontier = self.scheduler
+        router = self.router
+        scorer = self.scorer
+
+        def enqueue(url: str, depth: int) -> bool:
+            url = normalize_url(url)
+            if url is None or depth > self.depth:
+                return False
+            if url in self.visited_urls:
+                if scorer is not None:  # A new in-link may move a still-queued page up
+                    priority = scorer.priority(url, depth)
+                    if frontier.reprioritize(url, priority):
+                        self.store.reprioritize(url, priority)
+                return False
+            if router is not None and not router.owns(url):
+                self.visited_urls.add(url)  # Routed once; the owning shard dedupes across shards
+                router.send(url, depth)
+                self.metrics.inc('routed')
+                return False
+            if not self.robots.allowed(url, fetch=False):  # Hosts whose rules are cached already
+                return False
+            if looks_binary(url):
+                self.metrics.inc('skipped', reason='binary_extension')
+                return False
+            self.visited_urls.add(url)
+            priority = scorer.priority(url, depth) if scorer is not None else None
+            self.store.add(url, depth, priority)
+
+            record = self.history.get(url) if self.history is not None else None
+            if record is not None and not self.history.due(record):
+                # Not expected to have changed yet: follow its stored links without fetching it
+                self.metrics.inc('unchanged', reason='not_due')
+                self.store.done(url)
+                for link in record.links:
+                    enqueue(link, depth + 1)
+                return True
+
+            frontier.add(url, depth, priority)
+            if scorer is not None:
+                scorer.queued(url)
+            return True
+
+        if scorer is not None:
+            scorer.graph.seed(normalize_url(start_url or self.base_url) or start_url or self.base_url)
+        if resume:
+            seen = 0
+            for url in self.store.visited():  # Straight into the fingerprint index, row by row
+                self.visited_urls.add(url)
+                seen += 1
+            pending = self.store.load()
+            for url, depth, priority in pending:
+                if scorer is not None:  # Keep the best-first order the last run had reached
+                    frontier.add(url, depth, priority if priority is not None else scorer.priority(url, depth))
+                    scorer.queued(url)
+                else:
+                    frontier.add(url, depth)
+            print(f"Resuming: {len(pending)} pages queued, {seen} already seen")
+            if not seen:
+                enqueue(start_url or self.base_url, start_depth)
+        else:
+            self.store.reset()
+            enqueue(start_url or self.base_url, start_depth)
+            if self.sitemap_limit and (router is None or router.owns(start_url or self.base_url)):
+                seeded = self.seed_from_sitemaps(start_url or self.base_url, start_depth, enqueue)
+                print(f"Seeded {seeded} pages from sitemaps")
+
+        fetching = {}  # Fetcher futures -> (url, depth)
+        parsing = {}  # Parser process futures -> (url, depth)
+        parse_backlog = max(1, self.parse_workers * 4)  # Bound the fetched pages held in memory
+        parse_pool = None
+        if self.parse_workers:
+            parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers, initializer=init_worker,
+                                             initargs=(self.extractor.parser, self.extractor.schema,
+                                                       self.extractor.fingerprint, self.extractor.tables))
+        next_progress = time.monotonic() + self.progress_interval
+        dispatched = 0  # Pages handed to fetchers, counted against max_pages
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                while ((len(frontier) and not (self.max_pages and dispatched >= self.max_pages))
+                       or fetching or parsing or (router is not None and not router.finished())):
+                    if router is not None:
+                        for url, depth in router.receive():
+                            enqueue(url, depth)
+                        router.report(idle=not (len(frontier) or fetching or parsing))
+                    wait_for = None
+                    while len(fetching) < self.concurrency and len(parsing) < parse_backlog:
+                        if self.max_pages and dispatched >= self.max_pages:
+                            break
+                        item, wait_for = frontier.next_ready()
+                        if item is None:
+                            break
+                        url, depth = item
+                        task = self.download_body if parse_pool else self.scrape_page
+                        args = (url,) if parse_pool else (url, depth)
+                        fetching[pool.submit(task, *args)] = (url, depth)
+                        dispatched += 1
+                        wait_for = None
+
+                    if not fetching and not parsing:
+                        if self.max_pages and dispatched >= self.max_pages:
+                            break  # Budget spent; what is left stays queued for --resume
+                        if router is not None and not len(frontier):
+                            for url, depth in router.receive(timeout=0.2):  # Wait for other shards' links
+                                enqueue(url, depth)
+                            continue
+                        time.sleep(wait_for or 0)  # Every queued host is still cooling down
+                        continue
+
+                    done, _ = wait(set(fetching) | set(parsing), timeout=wait_for, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        fetched = future in fetching
+                        url, depth = fetching.pop(future) if fetched else parsing.pop(future)
+                        if fetched:
+                            frontier.release(url)
+                        try:
+                            result = future.result()
+                        except RetryLater:  # Fetched again once the host's Retry-After is over
+                            frontier.add(url, depth, scorer.priority(url, depth) if scorer is not None else None)
+                            dispatched -= 1
+                            continue
+                        except Exception as e:
+                            print(f"Error scraping {url}: {e}")
+                            result = None
+
+                        if fetched and parse_pool:
+                            if isinstance(result, tuple):  # Hand the raw page to a parser process
+                                parsing[parse_pool.submit(extract_in_worker, *result, url)] = (url, depth)
+                                continue
+                            links = result or []  # Failed, or unchanged with its stored links
+                        elif fetched:
+                            links = result or []
+                        elif result is not None:
+                            self.metrics.observe('parse', result.pop('parse_seconds'))
+                            links = self.save_page(url, depth, result)
+                        else:
+                            links = []
+
+                        if scorer is not None and links:
+                            scorer.graph.add_page(url, links)
+                        for link in links:
+                            enqueue(link, depth + 1)
+                        self.store.done(url)
+
+                    if self.store.due():
+                        self.checkpoint()
+                    if self.progress_interval and time.monotonic() >= next_progress:
+                        self.report_progress(len(frontier), len(fetching) + len(parsing))
+                        next_progress = time.monotonic() + self.progress_interval
+        finally:
+            if parse_pool:
+                parse_pool.shutdown(cancel_futures=True)
+            if self.assets is not None:
+                self.assets.close()  # Let queued downloads finish before the last metrics dump
+            self.checkpoint()
+            self.sink.close()
+            print(f"Saved {self.sink.written} pages to {self.save_path}")
+            if self.table_sink is not None:
+                self.table_sink.close()
+                print(f"Saved {self.table_sink.rows_written} table rows ({self.table_sink.format})")
+            if self.archive is not None:
+                self.archive.close()
+                print(f"Archived {self.archive.written} raw pages to {self.archive.directory}")
+
+        stats = self.transport.stats()
+        print(f"Requests: {stats['requests']}, connections reused: {stats['connections_reused']} "
+              f"({stats['reuse_ratio']:.0%}), DNS cache hits: {stats['dns_hits']}")
+
+    def scrape_recursive(self, url: str, current_depth: int):
+        """Scrape pages to a specified depth, starting from url."""
+        self.crawl(url, current_depth)
+
+# Example usage
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Web Scraper')
+    parser.add_argument('url', type=str, help='Base URL to scrape')
+    parser.add_argument('--depth', type=int, default=1, help='Depth of recursion for scraping')
+    parser.add_argument('--save_path', type=str, default='./scraped_data', help='Directory to save scraped data')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of pages fetched in parallel')
+    parser.add_argument('--pool_size', type=int, default=10, help='Keep-alive connections kept per host')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Read timeout in seconds for each request')
+    parser.add_argument('--parser', type=str, default='auto', choices=PARSERS, help='HTML parser backend')
+    parser.add_argument('--parse_workers', type=int, default=None,
+                        help='Parser processes (default: one per core, 0 parses on the fetcher threads)')
+    parser.add_argument('--select', type=str, action='append', default=[], metavar='NAME=CSS',
+                        help='Extract the text of the first element matching CSS as field NAME (repeatable)')
+    parser.add_argument('--schema', type=str, default=None,
+                        help='JSON file mapping field names to selectors, attributes and types (see schema.py)')
+    parser.add_argument('--tables', type=str, default=None, metavar='CSS',
+                        help='Extract the tables matching CSS into columnar files (e.g. "table")')
+    parser.add_argument('--table_format', type=str, default='auto', choices=TABLE_FORMATS,
+                        help='Table output format (auto: parquet when pyarrow is installed, else csv)')
+    parser.add_argument('--table_batch_rows', type=int, default=10000, help='Table rows per columnar batch')
+    parser.add_argument('--delay', type=float, default=1.0, help='Minimum seconds between requests to the same host')
+    parser.add_argument('--batch_size', type=int, default=100, help='Pages buffered before each write to disk')
+    parser.add_argument('--max_file_mb', type=int, default=100, help='Start a new output part after this many MB')
+    parser.add_argument('--compress', action='store_true', help='Gzip the JSONL and CSV output')
+    parser.add_argument('--checkpoint_interval', type=float, default=30.0,
+                        help='Seconds between saves of the crawl state')
+    parser.add_argument('--visited_max', type=int, default=None,
+                        help='Exact visited entries kept before spilling to the Bloom filter')
+    parser.add_argument('--bloom_capacity', type=int, default=0,
+                        help='URLs the Bloom-filter tier of the visited index is sized for (0 disables it)')
+    parser.add_argument('--dedupe_distance', type=int, default=-1,
+                        help='Treat pages whose SimHash differs by at most this many bits as duplicates, e.g. 3 '
+                             '(default -1: off)')
+    parser.add_argument('--sitemap_limit', type=int, default=0,
+                        help='Seed the crawl with up to this many URLs from the sitemaps of the start host')
+    parser.add_argument('--metrics_file', type=str, default=None,
+                        help='Write crawl metrics here at every checkpoint (.json for JSON, else Prometheus text)')
+    parser.add_argument('--progress_interval', type=float, default=10.0,
+                        help='Seconds between progress lines (0 disables them)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Re-crawl with conditional requests, skipping pages that are unchanged or not yet due')
+    parser.add_argument('--min_revisit_hours', type=float, default=1.0,
+                        help='Shortest revisit interval in incremental mode')
+    parser.add_argument('--max_revisit_days', type=float, default=30.0,
+                        help='Longest revisit interval in incremental mode')
+    parser.add_argument('--max_page_mb', type=float, default=10.0, help='Abandon pages larger than this')
+    parser.add_argument('--max_page_seconds', type=float, default=30.0,
+                        help='Abandon pages whose body takes longer than this to download')
+    parser.add_argument('--best_first', action='store_true',
+                        help='Fetch the best-linked pages first (in-links, OPIC importance, depth, host diversity)')
+    parser.add_argument('--url_rule', type=str, action='append', default=[], metavar='REGEX=WEIGHT',
+                        help='Add WEIGHT to the best-first score of URLs matching REGEX (repeatable)')
+    parser.add_argument('--max_pages', type=int, default=0, help='Stop after fetching this many pages (0: no limit)')
+    parser.add_argument('--archive', action='store_true',
+                        help='Keep raw responses in save_path/archive for `python archive.py reprocess`')
+    parser.add_argument('--archive_segment_mb', type=int, default=1024,
+                        help='Start a new archive segment after this many MB')
+    parser.add_argument('--download_assets', action='store_true',
+                        help='Download the images of saved pages into save_path/assets, stored by content hash')
+    parser.add_argument('--asset_workers', type=int, default=4, help='Concurrent asset downloads')
+    parser.add_argument('--asset_max_mb', type=float, default=5.0, help='Skip assets larger than this')
+    parser.add_argument('--asset_types', type=str, default='image/',
+                        help='Comma-separated Content-Type prefixes of the assets to keep')
+    parser.add_argument('--resume', action='store_true', help='Continue the crawl saved in save_path')
+
+    args = parser.parse_args()
+    selectors = dict(item.split('=', 1) for item in args.select)
+    schema = ExtractionSchema.from_file(args.schema) if args.schema else None
+
+    # Initialize the scraper with a base URL
+    scraper = WebScraper(args.url, depth=args.depth, save_path=args.save_path, concurrency=args.concurrency,
+                         delay=args.delay, pool_size=args.pool_size, timeout=args.timeout,
+                         parser=args.parser, selectors=selectors, batch_size=args.batch_size,
+                         max_file_mb=args.max_file_mb, compress=args.compress,
+                         checkpoint_interval=args.checkpoint_interval, visited_max=args.visited_max,
+                         bloom_capacity=args.bloom_capacity, parse_workers=args.parse_workers,
+                         dedupe_distance=args.dedupe_distance, sitemap_limit=args.sitemap_limit,
+                         metrics_file=args.metrics_file, progress_interval=args.progress_interval,
+                         incremental=args.incremental, min_revisit_hours=args.min_revisit_hours,
+                         max_revisit_days=args.max_revisit_days, max_page_mb=args.max_page_mb,
+                         max_page_seconds=args.max_page_seconds, schema=schema, tables=args.tables,
+                         table_format=args.table_format, table_batch_rows=args.table_batch_rows,
+                         best_first=args.best_first, url_rules=[parse_rule(rule) for rule in args.url_rule],
+                         max_pages=args.max_pages, archive=args.archive,
+                         archive_segment_mb=args.archive_segment_mb, download_assets=args.download_assets,
+                         asset_workers=args.asset_workers, asset_max_mb=args.asset_max_mb,
+                         asset_types=args.asset_types)
+
+    # Start scraping
+    scraper.crawl(args.url, 1, resume=args.resume)
+